@@ -12,6 +12,7 @@ class BaseController:
         self.files_dir = os.path.join(self.base_dir, "assets/files")
         self.database_dir = os.path.join(self.base_dir, "assets/database")
         self.cache_dir = os.path.join(self.base_dir, "assets/cache")
+        self.uploads_dir = os.path.join(self.base_dir, "assets/uploads")
 
     def generate_random_string(self, length: int = 12):
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
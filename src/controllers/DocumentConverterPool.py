@@ -0,0 +1,116 @@
+import time
+import threading
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from models import ConversionProfileEnum
+from logger import logger
+
+class DocumentConverterPool:
+    # One converter per pipeline profile, shared by every conversion in this process,
+    # so docling's layout and table models are loaded once instead of once per file.
+
+    # fast skips OCR, tables and figures, rich is the original full-fidelity pipeline
+    _profile_options = {
+        ConversionProfileEnum.FAST.value: {
+            "do_ocr": False,
+            "do_table_structure": False,
+            "table_mode": None,
+            "generate_picture_images": False,
+            "images_scale": 1.0,
+        },
+        ConversionProfileEnum.STANDARD.value: {
+            "do_ocr": True,
+            "do_table_structure": True,
+            "table_mode": TableFormerMode.FAST.value,
+            "generate_picture_images": False,
+            "images_scale": 1.0,
+        },
+        ConversionProfileEnum.RICH.value: {
+            "do_ocr": True,
+            "do_table_structure": True,
+            "table_mode": TableFormerMode.ACCURATE.value,
+            "generate_picture_images": True,
+            "images_scale": 3.0,
+        },
+    }
+
+    _converters = {}
+    _load_times = {}
+    _reuse_counts = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_profile_supported(cls, profile: str):
+        return profile in cls._profile_options
+
+    @classmethod
+    def get_profile_options(cls, profile: str):
+        return dict(cls._profile_options[profile])
+
+    @classmethod
+    def build_pipeline_options(cls, profile: str):
+
+        profile_options = cls.get_profile_options(profile)
+
+        pipline_options = PdfPipelineOptions()
+        # pipline_options.do_formula_enrichment = True
+        pipline_options.do_ocr = profile_options["do_ocr"]
+        pipline_options.do_table_structure = profile_options["do_table_structure"]
+        if profile_options["table_mode"]:
+            pipline_options.table_structure_options.mode = TableFormerMode(profile_options["table_mode"])
+        pipline_options.generate_picture_images = profile_options["generate_picture_images"]
+        pipline_options.images_scale = profile_options["images_scale"]
+
+        return pipline_options
+
+    @classmethod
+    def get_converter(cls, profile: str = ConversionProfileEnum.RICH.value):
+
+        with cls._lock:
+            converter = cls._converters.get(profile)
+
+            if converter is not None:
+                cls._reuse_counts[profile] += 1
+                logger.info(f"Reusing DocumentConverter for profile '{profile}' (reuses: {cls._reuse_counts[profile]})")
+                return converter
+
+            start_time = time.perf_counter()
+
+            converter = DocumentConverter(format_options={
+                InputFormat.PDF: PdfFormatOption(
+                    pipeline_options=cls.build_pipeline_options(profile))
+            })
+            converter.initialize_pipeline(InputFormat.PDF)
+
+            cls._converters[profile] = converter
+            cls._load_times[profile] = time.perf_counter() - start_time
+            cls._reuse_counts[profile] = 0
+
+            logger.info(f"Loaded DocumentConverter for profile '{profile}' in {cls._load_times[profile]:.2f}s")
+
+        return converter
+
+    @classmethod
+    def warm_up(cls, profiles: list):
+        for profile in profiles:
+            cls.get_converter(profile)
+
+    @classmethod
+    def validate_profiles(cls, profiles: list):
+        unsupported = [profile for profile in profiles if not cls.is_profile_supported(profile)]
+        if unsupported:
+            raise ValueError(
+                f"Unsupported conversion profiles {unsupported}, "
+                f"expected one of {list(cls._profile_options)}"
+            )
+
+
+# Used as the ProcessPoolExecutor initializer so each worker loads its models before the first file.
+# An initializer that raises breaks the whole pool, a failed warm-up only leaves the converter
+# to be loaded again on first use.
+def warm_up_converter_pool(profiles: list):
+    try:
+        DocumentConverterPool.warm_up(profiles)
+    except Exception as e:
+        logger.error(f"DocumentConverter warm-up failed, converters load on first use: {e}")
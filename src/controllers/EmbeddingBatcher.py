@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import time
+from .BaseController import BaseController
+from .ProcessController import get_tiktoken_encoding
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.MicroBatcher import MicroBatcher
+from utils.metrics import EMBEDDED_TEXTS, EMBEDDING_BATCH_LATENCY, EMBEDDING_CACHE_LOOKUPS, QUERY_EMBEDDING_BATCH_SIZE
+from logger import logger
+
+class EmbeddingBatcher(BaseController):
+    # Packs texts into provider sized batches, by count and by token budget, and embeds them
+    # concurrently. The semaphore is shared by every caller in the worker, so the number of
+    # in-flight embedding requests stays bounded however many indexing runs are active.
+
+    def __init__(self, embedding_client, db_client=None):
+        super().__init__()
+        self.embedding_client = embedding_client
+
+        self.cache_model = None
+        if db_client is not None and self.app_settings.EMBEDDING_CACHE_ENABLED:
+            self.cache_model = EmbeddingCacheModel(db_client=db_client)
+
+        self.max_batch_size = self.get_limit(
+            self.embedding_client.embedding_max_batch_size,
+            self.app_settings.EMBEDDING_BATCH_MAX_TEXTS
+        )
+        # Counted with the provider's own tokenizer when it has one, the margin absorbs the
+        # remaining difference, e.g. when a fallback encoding has to stand in for it
+        provider_max_batch_tokens = self.embedding_client.embedding_max_batch_tokens
+        if provider_max_batch_tokens:
+            provider_max_batch_tokens = int(provider_max_batch_tokens * self.app_settings.EMBEDDING_BATCH_TOKEN_MARGIN)
+        self.max_batch_tokens = self.get_limit(
+            provider_max_batch_tokens,
+            self.app_settings.EMBEDDING_BATCH_MAX_TOKENS
+        )
+        self.tokenizer_encoding = self.embedding_client.embedding_tokenizer_encoding \
+            or self.app_settings.CHUNK_TOKENIZER_ENCODING
+        self.semaphore = asyncio.Semaphore(self.app_settings.EMBEDDING_BATCH_CONCURRENCY)
+        self.provider_name = type(self.embedding_client).__name__
+
+        # Query texts from concurrent requests are coalesced into one provider call. Batches are
+        # dispatched concurrently, a query arriving during a provider round trip does not wait for it.
+        self.query_batcher = MicroBatcher(
+            process_batch=self.embed_query_batch,
+            max_batch_size=self.app_settings.QUERY_EMBEDDING_BATCH_SIZE,
+            max_wait_ms=self.app_settings.QUERY_EMBEDDING_MAX_WAIT_MS,
+            max_concurrent_batches=self.app_settings.EMBEDDING_BATCH_CONCURRENCY
+        )
+
+    def get_limit(self, provider_limit, configured_limit):
+        limits = [limit for limit in (provider_limit, configured_limit) if limit]
+        return min(limits) if limits else None
+
+    def count_tokens(self, texts: list, token_counts: list = None):
+        # Chunks carry a token_count in their metadata, counted with CHUNK_TOKENIZER_ENCODING. It is
+        # only reused when the provider counts with the same encoding, other texts are tokenized here.
+        if not token_counts or self.tokenizer_encoding != self.app_settings.CHUNK_TOKENIZER_ENCODING:
+            token_counts = [None] * len(texts)
+        token_counts = list(token_counts)
+        missing = [idx for idx, count in enumerate(token_counts) if count is None]
+
+        if missing:
+            encoding = get_tiktoken_encoding(self.tokenizer_encoding)
+            tokens = encoding.encode_batch([texts[idx] for idx in missing], disallowed_special=())
+            for idx, text_tokens in zip(missing, tokens):
+                token_counts[idx] = len(text_tokens)
+
+        return token_counts
+
+    def pack_batches(self, texts: list, token_counts: list = None):
+        # Returns (start, end) ranges over texts. A text over the token budget gets a batch of its own.
+        if self.max_batch_tokens:
+            token_counts = self.count_tokens(texts, token_counts)
+
+        batches = []
+        batch_start, batch_tokens = 0, 0
+        for idx in range(len(texts)):
+            text_tokens = token_counts[idx] if self.max_batch_tokens else 0
+
+            is_full = self.max_batch_size and idx - batch_start >= self.max_batch_size
+            is_over_budget = self.max_batch_tokens and batch_tokens + text_tokens > self.max_batch_tokens
+            if idx > batch_start and (is_full or is_over_budget):
+                batches.append((batch_start, idx))
+                batch_start, batch_tokens = idx, 0
+
+            batch_tokens += text_tokens
+
+        if batch_start < len(texts):
+            batches.append((batch_start, len(texts)))
+
+        return batches
+
+    async def embed_batch(self, texts: list, document_type: str):
+        async with self.semaphore:
+            start_time = time.perf_counter()
+            vectors = await self.embedding_client.aembed_text(texts, document_type)
+            EMBEDDING_BATCH_LATENCY.labels(provider=self.provider_name).observe(time.perf_counter() - start_time)
+
+        if not vectors or len(vectors) != len(texts):
+            return None
+
+        EMBEDDED_TEXTS.labels(provider=self.provider_name).inc(len(texts))
+        return vectors
+
+    async def embed(self, texts: list, document_type: str, token_counts: list = None):
+        # Vectors come back in the order of texts, None if any batch failed.
+        # Only texts missing from the embedding cache are sent to the provider.
+        if not texts:
+            return []
+
+        model_id = self.embedding_client.get_embedding_fingerprint()
+        if self.cache_model is None or not model_id:
+            return await self.embed_uncached(texts, document_type, token_counts)
+
+        text_hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        cached = await self.cache_model.get_embeddings(model_id, document_type, list(set(text_hashes)))
+
+        # Repeated texts within one call are embedded once
+        missing = {}
+        for idx, text_hash in enumerate(text_hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = idx
+
+        EMBEDDING_CACHE_LOOKUPS.labels(result="hit").inc(len(texts) - len(missing))
+        EMBEDDING_CACHE_LOOKUPS.labels(result="miss").inc(len(missing))
+
+        if missing:
+            missing_idx = list(missing.values())
+            vectors = await self.embed_uncached(
+                [texts[idx] for idx in missing_idx],
+                document_type,
+                [token_counts[idx] for idx in missing_idx] if token_counts else None
+            )
+            if vectors is None:
+                return None
+
+            embedded = dict(zip(missing.keys(), vectors))
+            await self.cache_model.insert_embeddings(model_id, document_type, embedded)
+            cached.update(embedded)
+
+        return [cached[text_hash] for text_hash in text_hashes]
+
+    async def embed_query(self, text: str):
+        # Vector of one query text, None if embedding failed
+        return await self.query_batcher.submit(text)
+
+    async def embed_query_batch(self, texts: list):
+        QUERY_EMBEDDING_BATCH_SIZE.observe(len(texts))
+        vectors = await self.embed(texts, DocumentTypeEnum.QUERY.value)
+        if vectors is None:
+            return [None] * len(texts)
+        return vectors
+
+    async def close(self):
+        await self.query_batcher.close()
+
+    async def embed_uncached(self, texts: list, document_type: str, token_counts: list = None):
+
+        batches = self.pack_batches(texts, token_counts)
+        results = await asyncio.gather(*[
+            self.embed_batch(texts[start: end], document_type)
+            for start, end in batches
+        ])
+
+        if any(vectors is None for vectors in results):
+            logger.error(f"Embedding failed for {sum(1 for v in results if v is None)} of {len(batches)} batches")
+            return None
+
+        return [vector for vectors in results for vector in vectors]
@@ -0,0 +1,116 @@
+import asyncio
+from .BaseController import BaseController
+from stores.llm.LLMEnums import DocumentTypeEnum
+from models.db_schemes import Project
+from logger import logger
+
+class IndexingPipeline(BaseController):
+    # Stored chunks flow through two bounded queues: embedding, then the vector db upsert.
+    # put() waits while the queues are full, so conversion never runs far ahead of indexing.
+
+    def __init__(self, nlp_controller, project: Project):
+        super().__init__()
+        self.nlp_controller = nlp_controller
+        self.collection_name = nlp_controller.create_collection_name(
+            project_id=project.project_id
+        )
+
+        self.batch_size = self.app_settings.INDEX_PIPELINE_BATCH_SIZE
+        self.embed_workers = self.app_settings.INDEX_PIPELINE_EMBED_WORKERS
+        self.embed_queue = asyncio.Queue(maxsize=self.app_settings.INDEX_PIPELINE_QUEUE_SIZE)
+        self.insert_queue = asyncio.Queue(maxsize=self.app_settings.INDEX_PIPELINE_QUEUE_SIZE)
+
+        self.embed_tasks = []
+        self.insert_task = None
+        self.indexed_chunks = 0
+        self.error = None
+
+    def start(self):
+        self.embed_tasks = [
+            asyncio.create_task(self.embed_stage())
+            for _ in range(self.embed_workers)
+        ]
+        self.insert_task = asyncio.create_task(self.insert_stage())
+
+    async def put(self, texts: list, metadatas: list, chunks_ids: list):
+        for start_idx in range(0, len(texts), self.batch_size):
+            await self.embed_queue.put((
+                texts[start_idx: start_idx + self.batch_size],
+                metadatas[start_idx: start_idx + self.batch_size],
+                chunks_ids[start_idx: start_idx + self.batch_size]
+            ))
+
+    async def close(self):
+        # Waits for every queued batch to be indexed, returns False if any batch failed
+        for _ in self.embed_tasks:
+            await self.embed_queue.put(None)
+        await asyncio.gather(*self.embed_tasks)
+
+        await self.insert_queue.put(None)
+        await self.insert_task
+
+        return self.error is None
+
+    def cancel(self):
+        for task in [*self.embed_tasks, self.insert_task]:
+            if task is not None:
+                task.cancel()
+
+    def fail(self, error: str):
+        # Later batches are still drained so producers never block on a full queue
+        logger.error(f"Indexing pipeline for {self.collection_name} failed: {error}")
+        if self.error is None:
+            self.error = error
+
+    async def embed_stage(self):
+        while True:
+            item = await self.embed_queue.get()
+            if item is None:
+                return
+
+            if self.error:
+                continue
+
+            texts, metadatas, chunks_ids = item
+            try:
+                vectors = await self.nlp_controller.embedding_batcher.embed(
+                    texts, DocumentTypeEnum.DOCUMENT.value,
+                    token_counts=[(m or {}).get("token_count") for m in metadatas]
+                )
+            except Exception as e:
+                self.fail(str(e))
+                continue
+
+            if not vectors or len(vectors) != len(texts):
+                self.fail("embedding returned no vectors")
+                continue
+
+            await self.insert_queue.put((texts, metadatas, chunks_ids, vectors))
+
+    async def insert_stage(self):
+        while True:
+            item = await self.insert_queue.get()
+            if item is None:
+                return
+
+            if self.error:
+                continue
+
+            texts, metadatas, chunks_ids, vectors = item
+            try:
+                is_inserted = await self.nlp_controller.vector_db_client.insert_many(
+                    collection_name=self.collection_name,
+                    texts=texts,
+                    vectors=vectors,
+                    metadatas=metadatas,
+                    ids=chunks_ids
+                )
+            except Exception as e:
+                self.fail(str(e))
+                continue
+
+            if is_inserted is False:
+                self.fail("vector db insert failed")
+                continue
+
+            self.indexed_chunks += len(texts)
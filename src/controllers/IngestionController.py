@@ -0,0 +1,460 @@
+import os
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .IndexingPipeline import IndexingPipeline
+from .DocumentConverterPool import DocumentConverterPool
+from models import AssetTypeEnum, ProcessingEnums
+from models.AssetModel import AssetModel
+from models.ChunkModel import ChunkModel
+from models.ProjectModel import ProjectModel
+from models.db_schemes import Project
+from logger import logger
+
+class IngestionController(BaseController):
+    # Runs the /process and /index/push work, either inside the request or from a queued job.
+    # on_progress(done, total, chunks) is awaited after every step; returning False stops the run.
+
+    def __init__(self, db_client, process_pool, nlp_controller):
+        super().__init__()
+        self.db_client = db_client
+        self.process_pool = process_pool
+        self.nlp_controller = nlp_controller
+
+    async def get_project_files(self, project: Project, file_id: str = None, asset_ids: list = None):
+
+        asset_model = await AssetModel.create_instance(
+            db_client = self.db_client
+        )
+
+        if asset_ids:
+            asset_files = await asset_model.get_assets_by_ids(
+                asset_project_id = project.project_id,
+                asset_ids = asset_ids
+            )
+            return {
+                asset_record.asset_id: asset_record.asset_name
+                for asset_record in asset_files
+            }
+
+        if file_id:
+            asset_record = await asset_model.get_asset_record(
+                asset_project_id = project.project_id,
+                asset_name = file_id
+            )
+
+            if not asset_record:
+                return None
+
+            return {
+                asset_record.asset_id: asset_record.asset_name
+            }
+
+        asset_files = await asset_model.get_all_project_assets(
+            asset_project_id = project.project_id,
+            asset_type = AssetTypeEnum.FILE.value
+        )
+
+        return {
+            asset_record.asset_id: asset_record.asset_name
+            for asset_record in asset_files
+        }
+
+    async def skip_duplicate_assets(self, project: Project, project_files_ids: dict):
+
+        asset_model = await AssetModel.create_instance(
+            db_client = self.db_client
+        )
+        chunk_model = await ChunkModel.create_instance(
+            db_client = self.db_client
+        )
+
+        project_assets = await asset_model.get_all_project_assets(
+            asset_project_id = project.project_id,
+            asset_type = AssetTypeEnum.FILE.value
+        )
+        chunked_asset_ids = await chunk_model.get_chunked_asset_ids(
+            project_id = project.project_id
+        )
+
+        # The first asset holding chunks for a given content hash owns them, identical assets reuse its chunks
+        hash_owners = {}
+        for asset_record in sorted(project_assets, key=lambda a: a.asset_id):
+            if asset_record.asset_hash and asset_record.asset_id in chunked_asset_ids:
+                hash_owners.setdefault(asset_record.asset_hash, asset_record.asset_id)
+
+        asset_hashes = {
+            asset_record.asset_id: asset_record.asset_hash
+            for asset_record in project_assets
+        }
+
+        unique_files_ids = {}
+        for asset_id, asset_name in sorted(project_files_ids.items()):
+            asset_hash = asset_hashes.get(asset_id)
+
+            if asset_hash is None:
+                unique_files_ids[asset_id] = asset_name
+                continue
+
+            owner_id = hash_owners.setdefault(asset_hash, asset_id)
+            if owner_id != asset_id:
+                logger.info(f"Skipping asset {asset_id}, same content as asset {owner_id}")
+                continue
+
+            unique_files_ids[asset_id] = asset_name
+
+        return unique_files_ids
+
+    def get_chunk_hash(self, chunk_text: str, chunk_metadata: dict = None):
+        content = chunk_text + json.dumps(chunk_metadata or {}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def store_asset_chunks(self, project: Project, asset_id: int, chunk_batches,
+                                 chunk_model: ChunkModel, index_pipeline: IndexingPipeline = None):
+
+        # Diff the new chunks against the stored ones by content hash, only new chunks are written
+        # and embedded, stored chunks that disappeared are removed from Postgres and the vector db
+        stored_chunks = defaultdict(list)
+        for stored_chunk in await chunk_model.get_asset_chunk_hashes(project_id=project.project_id, asset_id=asset_id):
+            stored_chunks[stored_chunk.chunk_hash].append(stored_chunk)
+
+        reordered_chunks = []
+        total_chunks = 0
+        inserted_chunks = 0
+        unchanged_chunks = 0
+
+        async for chunks in chunk_batches:
+
+            new_chunks_records = []
+
+            for chunk in chunks:
+                total_chunks += 1
+                chunk_hash = self.get_chunk_hash(chunk.page_content, chunk.metadata)
+
+                if stored_chunks.get(chunk_hash):
+                    stored_chunk = stored_chunks[chunk_hash].pop(0)
+                    unchanged_chunks += 1
+                    if stored_chunk.chunk_order != total_chunks:
+                        reordered_chunks.append({
+                            "chunk_id": stored_chunk.chunk_id,
+                            "chunk_project_id": project.project_id,
+                            "chunk_order": total_chunks
+                        })
+                    continue
+
+                new_chunks_records.append({
+                    "chunk_text": chunk.page_content,
+                    "chunk_metadata": chunk.metadata,
+                    "chunk_order": total_chunks,
+                    "chunk_project_id": project.project_id,
+                    "chunk_asset_id": asset_id,
+                    "chunk_hash": chunk_hash
+                })
+
+            if not new_chunks_records:
+                continue
+
+            # The returned ids go straight to indexing, the new rows are never read back
+            new_chunks_ids = await chunk_model.insert_many_chunks(chunks=new_chunks_records)
+            inserted_chunks += len(new_chunks_ids)
+
+            if index_pipeline is not None:
+                await index_pipeline.put(
+                    texts=[c["chunk_text"] for c in new_chunks_records],
+                    metadatas=[c["chunk_metadata"] for c in new_chunks_records],
+                    chunks_ids=new_chunks_ids
+                )
+
+        if total_chunks == 0:
+            return None
+
+        removed_chunks_ids = [
+            stored_chunk.chunk_id
+            for stored_chunk_group in stored_chunks.values()
+            for stored_chunk in stored_chunk_group
+        ]
+
+        if removed_chunks_ids:
+            if index_pipeline is not None:
+                _ = await self.nlp_controller.delete_from_vector_db(
+                    project=project,
+                    chunks_ids=removed_chunks_ids
+                )
+            _ = await chunk_model.delete_chunks_by_ids(
+                project_id=project.project_id,
+                chunk_ids=removed_chunks_ids
+            )
+
+        _ = await chunk_model.update_chunks_order(chunks_order=reordered_chunks)
+
+        logger.info(f"Asset {asset_id}: {inserted_chunks} new, {unchanged_chunks} unchanged, {len(removed_chunks_ids)} removed chunks")
+
+        return {
+            "inserted_chunks": inserted_chunks,
+            "unchanged_chunks": unchanged_chunks,
+            "deleted_chunks": len(removed_chunks_ids)
+        }
+
+    async def process_project(self, project: Project, project_files_ids: dict,
+                              do_reset: bool = False, chunk_size: int = None,
+                              overlap: int = None, do_index: bool = False,
+                              conversion_profile: str = None, on_progress=None):
+
+        chunk_model = await ChunkModel.create_instance(
+            db_client = self.db_client
+        )
+        project_model = await ProjectModel.create_instance(
+            db_client = self.db_client
+        )
+
+        process_controller = ProcessController(
+            project_id=project.project_id,
+            chunk_size=chunk_size,
+            chunk_overlap=overlap,
+            conversion_profile=conversion_profile
+        )
+
+        if do_reset:
+            _ = await self.nlp_controller.reset_vector_db_collection(
+                project = project
+            )
+            _ = await chunk_model.delete_chunks_by_project_id(
+                project_id = project.project_id
+            )
+
+        unique_files_ids = await self.skip_duplicate_assets(
+            project = project,
+            project_files_ids = project_files_ids
+        )
+        skipped_files = len(project_files_ids) - len(unique_files_ids)
+
+        # New chunks are embedded and indexed while the next ones are converted when asked to,
+        # or when the project was already indexed so the vector db stays in sync. Only new chunks
+        # go through the pipeline, so when stored chunks are missing from the vector db, because
+        # they were processed without do_index or their indexing failed, the whole project is
+        # indexed from Postgres once processing is done instead.
+        index_pipeline = None
+        needs_backfill = False
+        collection_existed = await self.nlp_controller.is_vector_db_collection_exists(project=project)
+
+        if do_index or collection_existed:
+            needs_backfill = await project_model.is_index_incomplete(project_id=project.project_id)
+            if not collection_existed and not needs_backfill:
+                needs_backfill = await chunk_model.get_total_chunks_count(project_id=project.project_id) > 0
+
+        if (do_index or collection_existed) and not needs_backfill:
+            _ = await project_model.set_index_incomplete(project_id=project.project_id, index_incomplete=True)
+            _ = await self.create_project_collections(project=project)
+            index_pipeline = IndexingPipeline(
+                nlp_controller=self.nlp_controller,
+                project=project
+            )
+            index_pipeline.start()
+
+        try:
+            result = await self.process_assets(
+                project=project,
+                unique_files_ids=unique_files_ids,
+                process_controller=process_controller,
+                chunk_model=chunk_model,
+                index_pipeline=index_pipeline,
+                on_progress=on_progress
+            )
+        except BaseException:
+            if index_pipeline is not None:
+                index_pipeline.cancel()
+            raise
+
+        if index_pipeline is not None:
+            is_indexed = await index_pipeline.close()
+            if result:
+                result["indexed_chunks"] = index_pipeline.indexed_chunks
+            if not is_indexed:
+                return False
+            _ = await project_model.set_index_incomplete(project_id=project.project_id, index_incomplete=False)
+
+        elif needs_backfill:
+            # Reset first, chunks that did reach the vector db before would otherwise be inserted twice.
+            # The embedding cache answers for every chunk embedded before, only the rest is embedded.
+            indexed = await self.index_project(project=project, do_reset=True)
+            if not indexed:
+                return False
+            if result:
+                result["indexed_chunks"] = indexed["inserted_items_count"]
+
+        if result:
+            result["skipped_files"] = skipped_files
+
+        return result
+
+    async def process_assets(self, project: Project, unique_files_ids: dict,
+                             process_controller: ProcessController, chunk_model: ChunkModel,
+                             index_pipeline: IndexingPipeline = None, on_progress=None):
+
+        asset_model = await AssetModel.create_instance(
+            db_client = self.db_client
+        )
+
+        no_records = 0
+        no_unchanged = 0
+        no_deleted = 0
+        no_files = 0
+
+        # One file per pool worker at a time, a large project does not hold every file's
+        # chunks and database work in flight at once
+        asset_semaphore = asyncio.Semaphore(self.app_settings.PROCESS_POOL_MAX_WORKERS or os.cpu_count())
+
+        async def process_asset(asset_id: int, asset_name: str):
+            async with asset_semaphore:
+                chunk_batches = process_controller.load_and_export_batches(
+                    executor = self.process_pool,
+                    file_name = asset_name
+                )
+                stored = await self.store_asset_chunks(
+                    project=project,
+                    asset_id=asset_id,
+                    chunk_batches=chunk_batches,
+                    chunk_model=chunk_model,
+                    index_pipeline=index_pipeline
+                )
+
+            if stored is not None and process_controller.get_extension(asset_name) == ProcessingEnums.PDF.value:
+                # Recorded so the fidelity of every stored PDF can be told apart later
+                _ = await asset_model.update_asset_config(
+                    asset_id=asset_id,
+                    asset_config={
+                        "conversion_profile": process_controller.conversion_profile,
+                        "conversion_options": DocumentConverterPool.get_profile_options(
+                            process_controller.conversion_profile
+                        )
+                    }
+                )
+
+            return asset_id, stored
+
+        # Files are converted in parallel, chunks are stored as they are produced
+        asset_tasks = [
+            asyncio.create_task(process_asset(asset_id, asset_name))
+            for asset_id, asset_name in unique_files_ids.items()
+        ]
+
+        try:
+            for processed_asset in asyncio.as_completed(asset_tasks):
+
+                asset_id, stored = await processed_asset
+
+                if stored is None:
+                    return False
+
+                no_records += stored["inserted_chunks"]
+                no_unchanged += stored["unchanged_chunks"]
+                no_deleted += stored["deleted_chunks"]
+                no_files += 1
+
+                if on_progress and not await on_progress(no_files, len(unique_files_ids), no_records):
+                    logger.info(f"Processing stopped for project {project.project_id} after {no_files} files")
+                    break
+        finally:
+            # However the loop ends, no file keeps storing chunks afterwards, and the caller
+            # closes or cancels the indexing pipeline only once every producer is gone
+            for task in asset_tasks:
+                task.cancel()
+            await asyncio.gather(*asset_tasks, return_exceptions=True)
+
+        return {
+            "inserted_chunks": no_records,
+            "unchanged_chunks": no_unchanged,
+            "deleted_chunks": no_deleted,
+            "processed_files": no_files
+        }
+
+    async def create_project_collections(self, project: Project, do_reset: bool = False):
+
+        vectordb_client = self.nlp_controller.vector_db_client
+        embedding_size = self.nlp_controller.embedding_client.embedding_size
+
+        collection_name = self.nlp_controller.create_collection_name(
+            project_id=project.project_id)
+
+        cache_name = self.nlp_controller.create_cache_name(
+            project_id=project.project_id
+        )
+
+        _ = await vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            do_reset=do_reset
+        )
+
+        _ = await vectordb_client.create_cache_collection(
+            cache_name=cache_name,
+            embedding_size=embedding_size,
+            do_reset=do_reset
+        )
+
+        return True
+
+    async def index_project(self, project: Project, do_reset: bool = False, on_progress=None):
+
+        chunk_model = await ChunkModel.create_instance(
+            db_client = self.db_client
+        )
+        project_model = await ProjectModel.create_instance(
+            db_client = self.db_client
+        )
+
+        inserted_items_count = 0
+        is_complete = True
+
+        # Cleared only once every chunk is in, a failed or stopped run leaves it set for the next /process
+        _ = await project_model.set_index_incomplete(project_id=project.project_id, index_incomplete=True)
+
+        _ = await self.create_project_collections(
+            project=project,
+            do_reset=do_reset
+        )
+
+        total_chunks_count = await chunk_model.get_total_chunks_count(
+            project_id=project.project_id
+        )
+        start_time = time.perf_counter()
+
+        async for page_chunks in chunk_model.iter_project_chunks(
+            project_id=project.project_id,
+            page_size=self.app_settings.INDEX_PUSH_PAGE_SIZE
+        ):
+
+            chunks_ids = [c.chunk_id for c in page_chunks]
+
+            is_inserted = await self.nlp_controller.index_into_vector_db(
+                project=project,
+                chunks=page_chunks,
+                chunks_ids=chunks_ids
+            )
+
+            if not is_inserted:
+                return False
+
+            inserted_items_count += len(page_chunks)
+
+            if on_progress and not await on_progress(inserted_items_count, total_chunks_count, inserted_items_count):
+                logger.info(f"Indexing stopped for project {project.project_id} after {inserted_items_count} chunks")
+                is_complete = False
+                break
+
+        if is_complete:
+            _ = await project_model.set_index_incomplete(project_id=project.project_id, index_incomplete=False)
+
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"Indexed {inserted_items_count} chunks of project {project.project_id} in {elapsed:.1f}s "
+            f"({inserted_items_count / max(elapsed, 1e-6):.1f} texts/s)"
+        )
+
+        return {
+            "inserted_items_count": inserted_items_count
+        }
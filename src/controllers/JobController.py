@@ -0,0 +1,197 @@
+import asyncio
+from datetime import datetime, timezone
+from .BaseController import BaseController
+from models import ResponseEnumeration, JobTypeEnum, JobStatusEnum
+from models.db_schemes import IngestionJob
+from logger import logger
+
+class JobController(BaseController):
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.workers = []
+
+    def start_workers(self, workers: int):
+        self.workers = [
+            asyncio.create_task(self.run_worker(worker_no))
+            for worker_no in range(workers)
+        ]
+        logger.info(f"Started {workers} ingestion job workers")
+
+    async def stop_workers(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def enqueue_job(self, project_id: int, job_type: str, job_payload: dict):
+
+        job = await self.app.container.job_model.create_job(job=IngestionJob(
+            job_type=job_type,
+            job_status=JobStatusEnum.QUEUED.value,
+            job_payload=job_payload,
+            job_total=0,
+            job_done=0,
+            job_chunks=0,
+            job_project_id=project_id
+        ))
+
+        logger.info(f"Queued {job_type} job {job.job_id} for project {project_id}")
+        return job
+
+    async def run_worker(self, worker_no: int):
+
+        job_model = self.app.container.job_model
+
+        while True:
+            try:
+                job = await job_model.claim_next_job(
+                    stale_after_seconds=self.app_settings.JOB_STALE_AFTER_SECONDS
+                )
+            except Exception as e:
+                logger.error(f"Job worker {worker_no} failed to claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.app_settings.JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            logger.info(f"Job worker {worker_no} picked {job.job_type} job {job.job_id}")
+            await self.run_job(job=job)
+
+    async def run_job(self, job: IngestionJob):
+        # The job body runs as its own task next to a heartbeat, so a cancelled job stops
+        # right away instead of at its next progress report
+
+        job_task = asyncio.create_task(self.execute_job(job=job))
+        heartbeat_task = asyncio.create_task(self.heartbeat_job(job=job, job_task=job_task))
+
+        try:
+            await asyncio.wait({job_task})
+        finally:
+            heartbeat_task.cancel()
+            job_task.cancel()
+            await asyncio.gather(job_task, heartbeat_task, return_exceptions=True)
+
+        if job_task.cancelled():
+            logger.info(f"Job {job.job_id} was cancelled while running")
+
+    async def heartbeat_job(self, job: IngestionJob, job_task: asyncio.Task):
+        # Keeps updated_at fresh while a long file converts without progress reports,
+        # otherwise another worker would claim the job as stale and run it a second time
+
+        job_model = self.app.container.job_model
+
+        while True:
+            await asyncio.sleep(self.app_settings.JOB_HEARTBEAT_INTERVAL_SECONDS)
+
+            try:
+                is_running = await job_model.touch_job(job_id=job.job_id)
+            except Exception as e:
+                logger.error(f"Heartbeat of job {job.job_id} failed: {str(e)}")
+                continue
+
+            if not is_running:
+                job_task.cancel()
+                return
+
+    async def execute_job(self, job: IngestionJob):
+
+        job_model = self.app.container.job_model
+        project_model = self.app.container.project_model
+        ingestion_controller = self.app.container.ingestion_controller
+        payload = job.job_payload or {}
+
+        async def on_progress(done: int, total: int, chunks: int):
+            return await job_model.update_job_progress(
+                job_id=job.job_id, done=done, total=total, chunks=chunks
+            )
+
+        try:
+            project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+            if job.job_type == JobTypeEnum.PROCESS.value:
+                project_files_ids = await ingestion_controller.get_project_files(
+                    project=project,
+                    file_id=payload.get("file_id"),
+                    asset_ids=payload.get("asset_ids")
+                )
+
+                if not project_files_ids:
+                    error_signal = ResponseEnumeration.FILE_ID_ERROR.value if payload.get("file_id") \
+                        else ResponseEnumeration.NO_FILES_ERROR.value
+                    await job_model.finish_job(job.job_id, JobStatusEnum.FAILED.value, job_error=error_signal)
+                    return
+
+                result = await ingestion_controller.process_project(
+                    project=project,
+                    project_files_ids=project_files_ids,
+                    do_reset=payload.get("do_reset", 0),
+                    chunk_size=payload.get("chunk_size"),
+                    overlap=payload.get("overlap"),
+                    do_index=payload.get("do_index", 0),
+                    conversion_profile=payload.get("conversion_profile"),
+                    on_progress=on_progress
+                )
+                error_signal = ResponseEnumeration.PROCESSING_FAILED.value
+
+            elif job.job_type == JobTypeEnum.INDEX.value:
+                result = await ingestion_controller.index_project(
+                    project=project,
+                    do_reset=payload.get("do_reset", 0),
+                    on_progress=on_progress
+                )
+                error_signal = ResponseEnumeration.INSERT_INTO_VECTORDB_ERROR.value
+
+            else:
+                result = False
+                error_signal = f"Unknown job type {job.job_type}"
+
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}")
+            await job_model.finish_job(job.job_id, JobStatusEnum.FAILED.value, job_error=str(e))
+            return
+
+        if not result:
+            await job_model.finish_job(job.job_id, JobStatusEnum.FAILED.value, job_error=error_signal)
+            return
+
+        # Does nothing if the job was cancelled while it was running
+        await job_model.finish_job(job.job_id, JobStatusEnum.COMPLETED.value, job_result=result)
+        logger.info(f"Job {job.job_id} finished: {result}")
+
+    def get_job_progress(self, job: IngestionJob):
+
+        elapsed_seconds = None
+        chunks_per_second = None
+        eta_seconds = None
+
+        if job.started_at:
+            end_time = job.finished_at or datetime.now(timezone.utc)
+            elapsed_seconds = max((end_time - job.started_at).total_seconds(), 0.0)
+
+        if elapsed_seconds:
+            chunks_per_second = round(job.job_chunks / elapsed_seconds, 2)
+
+            if job.job_status == JobStatusEnum.RUNNING.value and job.job_done > 0:
+                eta_seconds = round(elapsed_seconds / job.job_done * max(job.job_total - job.job_done, 0), 1)
+
+        return {
+            "job_id": job.job_id,
+            "job_type": job.job_type,
+            "status": job.job_status,
+            "project_id": job.job_project_id,
+            "done": job.job_done,
+            "total": job.job_total,
+            "progress": round(job.job_done / job.job_total, 4) if job.job_total else 0.0,
+            "chunks": job.job_chunks,
+            "chunks_per_second": chunks_per_second,
+            "elapsed_seconds": round(elapsed_seconds, 1) if elapsed_seconds is not None else None,
+            "eta_seconds": eta_seconds,
+            "result": job.job_result,
+            "error": job.job_error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
@@ -1,4 +1,5 @@
 from .BaseController import BaseController
+from .EmbeddingBatcher import EmbeddingBatcher
 from stores.llm.LLMEnums import DocumentTypeEnum
 from models.db_schemes import Project, DataChunk
 from routes.schemes.QueryExpand import SemanticExpansion
@@ -7,13 +8,14 @@ import json
 
 class NLPController(BaseController):
 
-    def __init__(self, vector_db_client, cross_encoder, embedding_client, generation_client, template_parser):
+    def __init__(self, vector_db_client, cross_encoder, embedding_client, generation_client, template_parser, db_client=None):
         super().__init__()
         self.vector_db_client = vector_db_client
         self.cross_encoder = cross_encoder
         self.embedding_client = embedding_client
         self.generation_client = generation_client
         self.template_parser = template_parser
+        self.embedding_batcher = EmbeddingBatcher(embedding_client=embedding_client, db_client=db_client)
 
     def create_collection_name(self, project_id: str):
         return f"collection_{project_id}".strip()
@@ -45,8 +47,13 @@ class NLPController(BaseController):
 
         texts = [c.chunk_text for c in chunks]
         metadata = [c.chunk_metadata for c in chunks]
-        vectors = self.embedding_client.embed_text(
-            texts, DocumentTypeEnum.DOCUMENT.value)
+        vectors = await self.embedding_batcher.embed(
+            texts, DocumentTypeEnum.DOCUMENT.value,
+            token_counts=[(m or {}).get("token_count") for m in metadata]
+        )
+
+        if vectors is None:
+            return False
 
         _ = await self.vector_db_client.create_collection(
             collection_name=collection_name,
@@ -63,6 +70,19 @@ class NLPController(BaseController):
 
         return True
     
+    async def is_vector_db_collection_exists(self, project: Project):
+        collection_name = self.create_collection_name(
+            project_id=project.project_id)
+        return await self.vector_db_client.is_collection_exists(collection_name=collection_name)
+
+    async def delete_from_vector_db(self, project: Project, chunks_ids: List[int]):
+        collection_name = self.create_collection_name(
+            project_id=project.project_id)
+        return await self.vector_db_client.delete_by_ids(
+            collection_name=collection_name,
+            ids=chunks_ids
+        )
+    
     async def query_expansion(self, query:str):
 
         system_prompt = self.template_parser.get("rag", "query_expand_system_prompt")
@@ -77,7 +97,7 @@ class NLPController(BaseController):
             )
         ]
 
-        answer = self.generation_client.generate_text(
+        answer = await self.generation_client.agenerate_text(
             prompt = user_prompt,
             chat_history = chat_history
         )
@@ -92,14 +112,7 @@ class NLPController(BaseController):
     
     async def query_embeddings(self, text: str):
         
-        vectors = self.embedding_client.embed_text(
-            text, DocumentTypeEnum.QUERY.value)
-
-        if not vectors or len(vectors) == 0:
-            return False
-
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        query_vector = await self.embedding_batcher.embed_query(text)
 
         if not query_vector:
             return False
@@ -222,7 +235,7 @@ class NLPController(BaseController):
             )
         ]
 
-        answer = self.generation_client.generate_text(
+        answer = await self.generation_client.agenerate_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
@@ -1,27 +1,84 @@
 import os
+import re
 import sys
+import queue
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 os.environ["HF_HUB_OFFLINE"] = "0"
 os.environ["TRANSFORMERS_OFFLINE"] = "1"
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 sys.stdout.reconfigure(encoding='utf-8')
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling_core.types.doc.document import ImageRefMode
-from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters.markdown import MarkdownHeaderTextSplitter
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import pandas as pd
+import pypdfium2
+import tiktoken
 from models import ResponseEnumeration, ProcessingEnums
 from .BaseController import BaseController
 from .ProjectController import ProjectController
+from .DocumentConverterPool import DocumentConverterPool
 from logger import logger
 
+@lru_cache(maxsize=None)
+def get_tiktoken_encoding(encoding_name: str):
+    return tiktoken.get_encoding(encoding_name)
+
+@lru_cache(maxsize=32)
+def get_token_text_splitter(chunk_size: int, chunk_overlap: int, encoding_name: str):
+    # Built once per process and size, instead of on every get_text_splitter / iter_text_chunk_batches call
+    encoding = get_tiktoken_encoding(encoding_name)
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=lambda text: len(encoding.encode(text, disallowed_special=()))
+    )
+
+_artifact_executor = None
+_artifact_executor_lock = threading.Lock()
+
+def get_artifact_executor():
+    # Created lazily, a pool worker that never converts a PDF never starts the thread
+    global _artifact_executor
+    with _artifact_executor_lock:
+        if _artifact_executor is None:
+            _artifact_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversion-artifacts")
+    return _artifact_executor
+
+_chunk_stream_manager = None
+_chunk_stream_manager_lock = threading.Lock()
+
+def get_chunk_stream_manager(start_method: str):
+    # Serves the queues streamed chunk batches travel through from a pool worker. Created lazily,
+    # a server that never processes a CSV, TXT or MD file never starts the manager process.
+    global _chunk_stream_manager
+    with _chunk_stream_manager_lock:
+        if _chunk_stream_manager is None:
+            _chunk_stream_manager = multiprocessing.get_context(start_method).Manager()
+    return _chunk_stream_manager
+
+def shutdown_chunk_stream_manager():
+    global _chunk_stream_manager
+    with _chunk_stream_manager_lock:
+        if _chunk_stream_manager is not None:
+            _chunk_stream_manager.shutdown()
+            _chunk_stream_manager = None
+
+PDF_PAGE_MARKER = "<!-- page: {page_no} -->"
+PDF_PAGE_MARKER_PATTERN = re.compile(r"^<!-- page: (\d+) -->[ \t]*(?:\n|$)", re.MULTILINE)
+
 class ProcessController(BaseController):
-    def __init__(self,project_id: str):
+    def __init__(self,project_id: str, chunk_size: int = None, chunk_overlap: int = None,
+                 conversion_profile: str = None):
         super().__init__()
         self.project_id = project_id
+        self.conversion_profile = conversion_profile or self.app_settings.DEFAULT_CONVERSION_PROFILE
+        self.chunk_size = chunk_size or self.app_settings.CHUNK_SIZE_TOKENS
+        self.chunk_overlap = chunk_overlap if chunk_overlap is not None else self.app_settings.CHUNK_OVERLAP_TOKENS
         self.header_to_split_on = [
             ("#", "Header 1"),
             ("##", "Header 2"),
@@ -43,106 +100,430 @@ class ProcessController(BaseController):
         
         return True, ResponseEnumeration.FILE_EXIST.value.format(file_path=file_path)
     
-    def convert_process_file_into_markdown(self, file_name: str):
+    def convert_process_file_into_markdown(self, file_name: str, page_range: tuple = None):
 
-        pipline_options = PdfPipelineOptions()
-        # pipline_options.do_formula_enrichment = True
-        # pipline_options.do_ocr = True
-        pipline_options.generate_picture_images = True
-        pipline_options.images_scale =3
-        
-        converter = DocumentConverter(format_options={
-        InputFormat.PDF: PdfFormatOption(pipeline_options=pipline_options)
-    })
+        converter = DocumentConverterPool.get_converter(self.conversion_profile)
         file_path = os.path.join(self.get_process_path(), file_name)
 
-        result = converter.convert(file_path)
+        if page_range:
+            result = converter.convert(file_path, page_range=page_range)
+        else:
+            result = converter.convert(file_path)
 
         return result
+
+    def get_pdf_page_count(self, file_name: str):
+
+        file_path = os.path.join(self.get_process_path(), file_name)
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def get_pdf_page_ranges(self, page_count: int):
+        # Inclusive, 1-based ranges as docling expects them
+        shard_pages = self.app_settings.PDF_SHARD_PAGES
+        return [
+            (start_page, min(start_page + shard_pages - 1, page_count))
+            for start_page in range(1, page_count + 1, shard_pages)
+        ]
+
+    def export_pages_markdown(self, conv_res):
+        # Each page is prefixed with a marker so chunks can be mapped back to their source pages
+        document = conv_res.document
+        return "\n\n".join(
+            PDF_PAGE_MARKER.format(page_no=page_no) + "\n\n" +
+            document.export_to_markdown(page_no=page_no, image_mode=ImageRefMode.PLACEHOLDER)
+            for page_no in sorted(document.pages)
+        )
+
+    def convert_pdf_pages(self, file_name: str, page_range: tuple = None):
+        conv_res = self.convert_process_file_into_markdown(file_name, page_range=page_range)
+        self.save_conversion_artifacts(conv_res, page_range=page_range)
+        return self.export_pages_markdown(conv_res)
+
+    def chunk_pdf_markdown(self, text: str):
+
+        chunks = []
+        page_no = 1
+
+        # Header sections are split again to chunk_size tokens. Page markers are removed only
+        # afterwards, so every piece still knows which pages it came from.
+        header_chunks = self.chunk_text_markdown(text)
+        for chunk in self.get_text_splitter().split_documents(header_chunks):
+            # Text before the first marker belongs to the page the previous chunk ended on,
+            # a page counts for this chunk only when some of its content landed here
+            segments = PDF_PAGE_MARKER_PATTERN.split(chunk.page_content)
+            chunk_pages = [page_no] if segments[0].strip() else []
+
+            for marker_page, segment in zip(segments[1::2], segments[2::2]):
+                page_no = int(marker_page)
+                if segment.strip():
+                    chunk_pages.append(page_no)
+
+            chunk.page_content = PDF_PAGE_MARKER_PATTERN.sub("", chunk.page_content).strip()
+            if not chunk.page_content:
+                continue
+
+            chunk.metadata = {**chunk.metadata, "page_start": chunk_pages[0], "page_end": chunk_pages[-1]}
+            chunks.append(chunk)
+
+        return chunks
     
-    def export_function_md_with_image_ref(self,conv_res,replace_blank:str="_"):
+    def export_function_md_with_image_ref(self,conv_res,replace_blank:str="_",page_range:tuple=None):
 
         doc_filename = conv_res.input.file.stem.replace(" ", replace_blank)
+        if page_range:
+            doc_filename = f"{doc_filename}-pages-{page_range[0]}-{page_range[1]}"
         # Save markdown with externally referenced pictures
         md_filename = os.path.join(self.get_process_path(), f"{doc_filename}-with-image-refs.md")
         conv_res.document.save_as_markdown(md_filename, image_mode=ImageRefMode.REFERENCED, include_annotations=True)
         file_id = f"{doc_filename}-with-image-refs.md"
         return file_id
     
+    def save_conversion_artifacts(self, conv_res, page_range: tuple = None):
+        # The markdown and image files are for people browsing the project folder, chunking
+        # never reads them, so they are written in the background after the chunks are returned
+        if not self.app_settings.SAVE_CONVERSION_ARTIFACTS:
+            return None
+
+        def log_artifact_error(future):
+            if future.exception() is not None:
+                logger.error(f"Error saving conversion artifacts: {str(future.exception())}")
+
+        future = get_artifact_executor().submit(
+            self.export_function_md_with_image_ref, conv_res, page_range=page_range
+        )
+        future.add_done_callback(log_artifact_error)
+        return future
+
     def chunk_text_markdown(self, text: str):
 
         splitter = MarkdownHeaderTextSplitter(headers_to_split_on=self.header_to_split_on, strip_headers=False)
         chunks = splitter.split_text(text)
         return chunks
     
-    def recursive_chunk_text(self, documents):
-
-        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=1000,
-            chunk_overlap=200
+    def get_text_splitter(self):
+        return get_token_text_splitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=min(self.chunk_overlap, self.chunk_size - 1),
+            encoding_name=self.app_settings.CHUNK_TOKENIZER_ENCODING
         )
-        chunks = splitter.split_documents(documents)
+
+    def add_token_counts(self, chunks):
+        # Tokenized once here, context packing can budget by token_count without tokenizing again
+        encoding = get_tiktoken_encoding(self.app_settings.CHUNK_TOKENIZER_ENCODING)
+        tokens = encoding.encode_batch([chunk.page_content for chunk in chunks], disallowed_special=())
+
+        for chunk, chunk_tokens in zip(chunks, tokens):
+            chunk.metadata = {**(chunk.metadata or {}), "token_count": len(chunk_tokens)}
+
         return chunks
-    
-    def load_markdown_or_txt_file(self, file_name:str):
+
+    def get_markdown_header(self, line: str):
+
+        stripped_line = line.strip()
+        # Longest markers first so "##" is not taken for "#"
+        for level, (marker, name) in sorted(enumerate(self.header_to_split_on), key=lambda h: -len(h[1][0])):
+            if stripped_line.startswith(marker) and (
+                len(stripped_line) == len(marker) or stripped_line[len(marker)] == " "
+            ):
+                return level, name, stripped_line[len(marker):].strip()
+
+        return None
+
+    def iter_text_chunk_batches(self, file_name: str, is_markdown: bool = False):
 
         file_path = os.path.join(self.get_process_path(), file_name)
+        buffer_size = self.app_settings.TEXT_STREAM_BUFFER_SIZE
+        batch_size = self.app_settings.TEXT_STREAM_BATCH_SIZE
 
-        loader = TextLoader(file_path,encoding="utf-8")
-        documents = loader.load()
-        return documents
+        splitter = self.get_text_splitter()
+
+        headers = {}
+        section_metadata = {} if is_markdown else {"source": file_path}
+        section_parts = []
+        section_length = 0
+        in_code_block = False
+        chunk_batch = []
+
+        def split_section(is_final: bool):
+            # Every chunk but the last is final, the last one is carried over and re-split together
+            # with the text that follows, so chunks across buffer boundaries keep their overlap
+            text = "".join(section_parts)
+            if not text.strip():
+                return [], ""
+
+            chunks = splitter.create_documents([text], metadatas=[dict(section_metadata)])
+            if is_final or len(chunks) <= 1:
+                return chunks, ""
+
+            carry_start = text.rfind(chunks[-1].page_content)
+            return chunks[:-1], text[carry_start:]
+
+        with open(file_path, encoding="utf-8") as f:
+            # readline(limit) bounds memory even for files without line breaks
+            while line := f.readline(buffer_size):
+
+                if is_markdown:
+                    stripped_line = line.strip()
+                    if stripped_line.startswith("```") or stripped_line.startswith("~~~"):
+                        in_code_block = not in_code_block
+
+                    header = None if in_code_block else self.get_markdown_header(line)
+
+                    if header is not None:
+                        chunks, _ = split_section(is_final=True)
+                        chunk_batch.extend(chunks)
+
+                        # A new header closes every header of the same or a deeper level
+                        level, name, title = header
+                        headers = {
+                            header_name: (header_level, header_title)
+                            for header_name, (header_level, header_title) in headers.items()
+                            if header_level < level
+                        }
+                        headers[name] = (level, title)
+                        section_metadata = {header_name: header_title for header_name, (_, header_title) in headers.items()}
+                        section_parts, section_length = [], 0
+
+                section_parts.append(line)
+                section_length += len(line)
+
+                if section_length >= buffer_size:
+                    chunks, carry = split_section(is_final=False)
+                    chunk_batch.extend(chunks)
+                    section_parts, section_length = [carry], len(carry)
+
+                if len(chunk_batch) >= batch_size:
+                    yield chunk_batch
+                    chunk_batch = []
+
+        chunks, _ = split_section(is_final=True)
+        chunk_batch.extend(chunks)
+
+        if chunk_batch:
+            yield chunk_batch
+
+    def load_text_file_chunks(self, file_name: str, is_markdown: bool = False):
+
+        chunks = []
+        for chunk_batch in self.iter_text_chunk_batches(file_name, is_markdown=is_markdown):
+            chunks.extend(chunk_batch)
+
+        return chunks
     
-    def parse_csv_file(self, file_name:str):
-        # Placeholder for CSV parsing logic
-        # You can use pandas or csv module to read and process CSV files
+    def iter_csv_chunk_batches(self, file_name:str):
+
         file_path = os.path.join(self.get_process_path(), file_name)
-        df = pd.read_csv(file_path)
+        max_characters = self.app_settings.CSV_CHUNK_MAX_CHARACTERS
 
-        df.dropna(how="all", inplace=True)
-        df.dropna(axis=1, how="all", inplace=True)
+        # Read a fixed number of rows at a time so memory stays flat whatever the file size
+        for frame in pd.read_csv(file_path, chunksize=self.app_settings.CSV_READ_CHUNK_ROWS, dtype=str):
 
-        documents = []
-        for i, row in df.iterrows():
-            content = ", ".join([f"{col}: {row[col]}" for col in df.columns if pd.notna(row[col])])
+            # Build the "col: value, col: value" rows column by column instead of row by row
+            content = pd.Series("", index=frame.index, dtype=object)
+            for col in frame.columns:
+                values = frame[col]
+                content = content + (f"{col}: " + values + ", ").where(values.notna(), "")
+
+            content = content.str.slice(stop=-2)
+            content = content[content.str.len() > 0]
+
+            if content.empty:
+                continue
 
-            documents.append(
-                Document(page_content=content, metadata={"source": file_name, "row_index": i})
+            # Consecutive rows are grouped into one chunk of up to max_characters
+            if max_characters and max_characters > 0:
+                group_ids = (content.str.len() + 1).cumsum().sub(1) // max_characters
+            else:
+                group_ids = pd.Series(range(len(content)), index=content.index)
+
+            grouped_texts = content.groupby(group_ids, sort=False).agg("\n".join)
+            grouped_rows = content.index.to_series().groupby(group_ids.values, sort=False).agg(["min", "max"])
+
+            yield [
+                Document(
+                    page_content=text,
+                    metadata={"source": file_name, "row_index": int(row_start), "row_end": int(row_end)}
                 )
-            
+                for text, row_start, row_end in zip(grouped_texts.values, grouped_rows["min"].values, grouped_rows["max"].values)
+            ]
+
+    def parse_csv_file(self, file_name:str):
+
+        documents = []
+        for chunk_batch in self.iter_csv_chunk_batches(file_name):
+            documents.extend(chunk_batch)
+
         return documents
-            
+
+    def is_streamed_file(self, file_name: str):
+        return self.get_extension(file_name) in [
+            ProcessingEnums.CSV.value,
+            ProcessingEnums.MARKDOWN.value,
+            ProcessingEnums.TXT.value,
+        ]
+
+    def iter_chunk_batches(self, file_name: str):
+
+        ext = self.get_extension(file_name)
+
+        if ext == ProcessingEnums.CSV.value:
+            chunk_batches = self.iter_csv_chunk_batches(file_name)
+
+        elif ext == ProcessingEnums.MARKDOWN.value:
+            chunk_batches = self.iter_text_chunk_batches(file_name, is_markdown=True)
+
+        elif ext == ProcessingEnums.TXT.value:
+            chunk_batches = self.iter_text_chunk_batches(file_name)
+
+        else:
+            return
+
+        for chunk_batch in chunk_batches:
+            yield self.add_token_counts(chunk_batch)
+
     def load_and_export(self, file_name:str):
 
         ext = self.get_extension(file_name)
 
         try:
             if ext == ProcessingEnums.PDF.value:
-                conv_res = self.convert_process_file_into_markdown(file_name)
-                file_id = self.export_function_md_with_image_ref(conv_res)
-                documents = self.load_markdown_or_txt_file(file_id)
-                chunks = self.chunk_text_markdown(documents[0].page_content)
+                chunks = self.chunk_pdf_markdown(self.convert_pdf_pages(file_name))
                 logger.info(f"Initial chunks from PDF conversion: {len(chunks)}")
             
             elif ext == ProcessingEnums.MARKDOWN.value:
-                documents = self.load_markdown_or_txt_file(file_name)
-                chunks = self.chunk_text_markdown(documents[0].page_content)
-                chunks = self.recursive_chunk_text(chunks)
+                chunks = self.load_text_file_chunks(file_name, is_markdown=True)
                 logger.info(f"Initial chunks from Markdown file: {len(chunks)}")
             
             elif ext == ProcessingEnums.TXT.value:
-                documents = self.load_markdown_or_txt_file(file_name)
-                chunks = self.recursive_chunk_text(documents)
+                chunks = self.load_text_file_chunks(file_name)
                 logger.info(f"Initial chunks from TXT file: {len(chunks)}")
 
             elif ext == ProcessingEnums.CSV.value:
                 chunks = self.parse_csv_file(file_name)
                 logger.info(f"Initial chunks from CSV file: {len(chunks)}")
 
-            return chunks
+            return self.add_token_counts(chunks)
         
         except Exception as e:
             logger.error(f"Error in load_and_export: {str(e)}")
             raise e
-    
 
+    async def load_and_export_in_pool(self, executor, file_name: str):
+
+        loop = asyncio.get_running_loop()
+
+        if self.get_extension(file_name) == ProcessingEnums.PDF.value:
+            page_count = await asyncio.to_thread(self.get_pdf_page_count, file_name)
+
+            if page_count >= self.app_settings.PDF_SHARD_MIN_PAGES:
+                return await self.load_and_export_pdf_shards(executor, file_name, page_count)
+
+        chunks = await loop.run_in_executor(
+            executor, load_and_export_in_worker, self.project_id, file_name,
+            self.chunk_size, self.chunk_overlap, self.conversion_profile
+        )
+        return chunks
+
+    async def load_and_export_pdf_shards(self, executor, file_name: str, page_count: int):
+
+        # Page ranges are converted in parallel workers, then merged in page order so
+        # header-based chunking sees the document as one piece
+        loop = asyncio.get_running_loop()
+        page_ranges = self.get_pdf_page_ranges(page_count)
+
+        logger.info(f"Converting {file_name} ({page_count} pages) in {len(page_ranges)} shards")
+
+        pages_markdown = await asyncio.gather(*[
+            loop.run_in_executor(
+                executor, convert_pdf_pages_in_worker, self.project_id, file_name, page_range,
+                self.conversion_profile
+            )
+            for page_range in page_ranges
+        ])
+
+        chunks = await asyncio.to_thread(self.chunk_pdf_markdown, "\n\n".join(pages_markdown))
+        logger.info(f"Initial chunks from sharded PDF conversion: {len(chunks)}")
+
+        return await asyncio.to_thread(self.add_token_counts, chunks)
+
+    async def load_and_export_batches(self, executor, file_name: str):
+
+        if not self.is_streamed_file(file_name):
+            chunks = await self.load_and_export_in_pool(executor, file_name)
+            if chunks:
+                yield chunks
+            return
+
+        # Streamed formats are chunked in a pool worker, like every other format, and handed over
+        # batch by batch through a bounded queue. The worker stays at most CHUNK_STREAM_QUEUE_SIZE
+        # batches ahead of the database writes, so memory stays flat whatever the file size.
+        loop = asyncio.get_running_loop()
+        manager = await asyncio.to_thread(get_chunk_stream_manager, self.app_settings.PROCESS_POOL_START_METHOD)
+        batch_queue = manager.Queue(maxsize=self.app_settings.CHUNK_STREAM_QUEUE_SIZE)
+        stop_event = manager.Event()
+
+        worker_future = loop.run_in_executor(
+            executor, stream_chunk_batches_in_worker, self.project_id, file_name,
+            self.chunk_size, self.chunk_overlap, batch_queue, stop_event
+        )
+
+        try:
+            while True:
+                try:
+                    chunk_batch = await asyncio.to_thread(batch_queue.get, True, 1.0)
+                except queue.Empty:
+                    # A worker that failed or died never sends the end marker, its error is raised here
+                    if worker_future.done():
+                        await worker_future
+                        break
+                    continue
+
+                if chunk_batch is None:
+                    break
+                yield chunk_batch
+
+            await worker_future
+        finally:
+            # A consumer that stops early, or is cancelled, releases the worker blocked on the full queue
+            stop_event.set()
+
+
+# Module level so it can be pickled and run inside a ProcessPoolExecutor worker
+def load_and_export_in_worker(project_id: str, file_name: str, chunk_size: int = None,
+                              chunk_overlap: int = None, conversion_profile: str = None):
+    return ProcessController(
+        project_id=project_id, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+        conversion_profile=conversion_profile
+    ).load_and_export(file_name=file_name)
+
+def stream_chunk_batches_in_worker(project_id: str, file_name: str, chunk_size: int, chunk_overlap: int,
+                                   batch_queue, stop_event):
+
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                batch_queue.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    process_controller = ProcessController(
+        project_id=project_id, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    for chunk_batch in process_controller.iter_chunk_batches(file_name):
+        if not put(chunk_batch):
+            return False
+
+    # None marks the end of the file
+    return put(None)
 
+def convert_pdf_pages_in_worker(project_id: str, file_name: str, page_range: tuple,
+                                conversion_profile: str = None):
+    return ProcessController(
+        project_id=project_id, conversion_profile=conversion_profile
+    ).convert_pdf_pages(file_name=file_name, page_range=page_range)
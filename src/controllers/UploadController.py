@@ -1,7 +1,13 @@
 import os
+import json
+import time
+import shutil
+import hashlib
+import aiofiles
 from .BaseController import BaseController
 from .ProjectController import ProjectController
-from fastapi import UploadFile
+from fastapi import UploadFile, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
 from models import ResponseEnumeration
 import re
 
@@ -13,15 +19,124 @@ class UploadController(BaseController):
 
 
     def validate_file(self, file: UploadFile):
+        return self.validate_file_info(content_type=file.content_type, file_size=file.size)
+
+    def validate_file_info(self, content_type: str, file_size: int = None):
         # Validate file type
-        if file.content_type not in self.app_settings.FILE_ALLOWED_EXTENSIONS:
-            return False, ResponseEnumeration.INVALID_FILE_TYPE.value.format(file_type=file.content_type)
+        if content_type not in self.app_settings.FILE_ALLOWED_EXTENSIONS:
+            return False, ResponseEnumeration.INVALID_FILE_TYPE.value.format(file_type=content_type)
         
         # Validate file size
-        if file.size is not None and file.size > self.app_settings.MAX_FILE_SIZE * self.size_scale:
+        if file_size is not None and file_size > self.get_max_file_size():
             return False, ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=self.app_settings.MAX_FILE_SIZE)
         
         return True, ResponseEnumeration.FILE_VALIDATION_SUCCESS.value
+
+    def get_max_file_size(self):
+        return self.app_settings.MAX_FILE_SIZE * self.size_scale
+
+    async def iter_upload_file(self, file: UploadFile):
+        while content := await file.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+            yield content
+
+    async def iter_multipart_events(self, request: Request):
+        # Parses a multipart/form-data body as it streams in, yielding ("part", headers),
+        # ("data", bytes) and ("end", None) events. Nothing is spooled to a temp file first.
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            return
+
+        events = []
+        header = {"field": b"", "value": b"", "headers": {}}
+
+        def on_part_begin():
+            header["headers"] = {}
+
+        def on_header_field(data, start, end):
+            header["field"] += data[start:end]
+
+        def on_header_value(data, start, end):
+            header["value"] += data[start:end]
+
+        def on_header_end():
+            header["headers"][header["field"].lower()] = header["value"]
+            header["field"], header["value"] = b"", b""
+
+        def on_headers_finished():
+            events.append(("part", header["headers"]))
+
+        def on_part_data(data, start, end):
+            events.append(("data", bytes(data[start:end])))
+
+        def on_part_end():
+            events.append(("end", None))
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        })
+
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event in events:
+                yield event
+            events.clear()
+
+        parser.finalize()
+
+    async def open_multipart_file(self, request: Request, field_name: str = "file"):
+        # Returns (filename, content_type, data stream) of the first file part named field_name,
+        # or None. The data stream reads the body on demand, so its size limit applies while it arrives.
+        events = self.iter_multipart_events(request)
+
+        async for event, headers in events:
+            if event != "part":
+                continue
+
+            _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+            if disposition.get(b"name") != field_name.encode() or b"filename" not in disposition:
+                continue
+
+            async def iter_part_data():
+                async for part_event, data in events:
+                    if part_event == "end":
+                        return
+                    if part_event == "data":
+                        yield data
+
+            return (
+                disposition[b"filename"].decode("utf-8", errors="replace"),
+                headers.get(b"content-type", b"").decode("latin-1"),
+                iter_part_data()
+            )
+
+        return None
+
+    async def save_upload_stream(self, stream, file_location: str, max_size: int):
+        # The declared size can be missing or wrong, the limit is enforced on the bytes actually received.
+        # Returns the sha256 hex digest and size, or None when the limit was exceeded and the file removed.
+        file_hash = hashlib.sha256()
+        file_size = 0
+
+        async with aiofiles.open(file_location, 'wb') as f:
+            async for content in stream:
+                file_size += len(content)
+                if file_size > max_size:
+                    break
+                file_hash.update(content)
+                await f.write(content)
+
+        if file_size > max_size:
+            os.remove(file_location)
+            return None
+
+        return file_hash.hexdigest(), file_size
     
     def generate_unique_filename(self, original_filename: str, project_id: str):
         
@@ -46,4 +161,131 @@ class UploadController(BaseController):
         # replace spaces with underscore
         cleaned_file_name = cleaned_file_name.replace(" ", "_")
 
-        return cleaned_file_name
\ No newline at end of file
+        return cleaned_file_name
+
+    def get_session_path(self, project_id: str, session_id: str):
+        return os.path.join(self.uploads_dir, str(project_id), session_id)
+
+    def remove_expired_sessions(self, project_id: str):
+
+        project_uploads_dir = os.path.join(self.uploads_dir, str(project_id))
+        if not os.path.isdir(project_uploads_dir):
+            return 0
+
+        expire_before = time.time() - self.app_settings.UPLOAD_SESSION_TTL_SECONDS
+        removed = 0
+
+        for session_id in os.listdir(project_uploads_dir):
+            session_path = os.path.join(project_uploads_dir, session_id)
+            if os.path.getmtime(session_path) < expire_before:
+                shutil.rmtree(session_path, ignore_errors=True)
+                removed += 1
+
+        return removed
+
+    def create_upload_session(self, project_id: str, file_name: str, file_size: int,
+                              content_type: str, sha256: str = None):
+
+        self.remove_expired_sessions(project_id)
+
+        session_id = self.generate_random_string(length=24)
+        session_path = self.get_session_path(project_id, session_id)
+        os.makedirs(session_path)
+
+        session = {
+            "session_id": session_id,
+            "project_id": project_id,
+            "file_name": file_name,
+            "file_size": file_size,
+            "content_type": content_type,
+            "sha256": sha256.lower() if sha256 else None,
+            "part_size": self.app_settings.UPLOAD_PART_SIZE,
+        }
+
+        with open(os.path.join(session_path, "session.json"), "w", encoding="utf-8") as f:
+            json.dump(session, f)
+
+        return session
+
+    def get_upload_session(self, project_id: str, session_id: str):
+
+        # session ids are generated lowercase alphanumerics, anything else never names a session
+        if not session_id.isalnum():
+            return None
+
+        session_file = os.path.join(self.get_session_path(project_id, session_id), "session.json")
+        if not os.path.exists(session_file):
+            return None
+
+        with open(session_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def save_session_part(self, session: dict, offset: int, stream):
+        # Each part is its own file named by its offset, so parts can arrive in parallel and in any
+        # order, and a retried part replaces the previous attempt. It only becomes visible once complete.
+        session_path = self.get_session_path(session["project_id"], session["session_id"])
+        part_path = os.path.join(session_path, f"{offset}.part")
+        tmp_path = f"{part_path}.{self.generate_random_string()}.tmp"
+
+        saved = await self.save_upload_stream(
+            stream=stream,
+            file_location=tmp_path,
+            max_size=session["file_size"] - offset
+        )
+
+        if saved is None:
+            return None
+
+        os.replace(tmp_path, part_path)
+        return saved[1]
+
+    def get_session_parts(self, session: dict):
+        # Returns the stored (offset, size) parts in order and the byte ranges still missing
+        session_path = self.get_session_path(session["project_id"], session["session_id"])
+
+        parts = sorted(
+            (int(name[:-len(".part")]), os.path.getsize(os.path.join(session_path, name)))
+            for name in os.listdir(session_path)
+            if name.endswith(".part")
+        )
+
+        missing_ranges = []
+        expected_offset = 0
+        for offset, size in parts:
+            if offset > expected_offset:
+                missing_ranges.append([expected_offset, offset])
+            expected_offset = max(expected_offset, offset + size)
+
+        if expected_offset < session["file_size"]:
+            missing_ranges.append([expected_offset, session["file_size"]])
+
+        return parts, missing_ranges
+
+    async def assemble_session_file(self, session: dict, file_location: str):
+        # Parts may overlap after retries with a different part size, only the bytes not
+        # written yet are copied from each part. Returns the sha256 hex digest of the file.
+        session_path = self.get_session_path(session["project_id"], session["session_id"])
+        parts, _ = self.get_session_parts(session)
+
+        file_hash = hashlib.sha256()
+        written = 0
+
+        async with aiofiles.open(file_location, 'wb') as f:
+            for offset, size in parts:
+                if offset + size <= written:
+                    continue
+
+                async with aiofiles.open(os.path.join(session_path, f"{offset}.part"), 'rb') as part:
+                    await part.seek(written - offset)
+                    while content := await part.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                        file_hash.update(content)
+                        await f.write(content)
+                        written += len(content)
+
+        return file_hash.hexdigest()
+
+    def remove_upload_session(self, session: dict):
+        shutil.rmtree(
+            self.get_session_path(session["project_id"], session["session_id"]),
+            ignore_errors=True
+        )
@@ -1,4 +1,9 @@
 from .UploadController import UploadController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
-from .NLPController import NLPController
\ No newline at end of file
+from .EmbeddingBatcher import EmbeddingBatcher
+from .NLPController import NLPController
+from .DocumentConverterPool import DocumentConverterPool
+from .IndexingPipeline import IndexingPipeline
+from .IngestionController import IngestionController
+from .JobController import JobController
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from functools import lru_cache
 
 class Settings(BaseSettings):
 
@@ -8,12 +9,69 @@ class Settings(BaseSettings):
     FILE_ALLOWED_EXTENSIONS: list
     MAX_FILE_SIZE: int  
     FILE_DEFAULT_CHUNK_SIZE: int  # in bytes
+    UPLOAD_BATCH_MAX_FILES: int = 1000
+    UPLOAD_BATCH_CONCURRENCY: int = 16
+    UPLOAD_PART_SIZE: int = 8388608  # in bytes, suggested to clients of resumable uploads
+    UPLOAD_SESSION_TTL_SECONDS: int = 86400
+
+    PROCESS_POOL_MAX_WORKERS: Optional[int] = None
+    PROCESS_POOL_START_METHOD: str = "spawn"
+    DEFAULT_CONVERSION_PROFILE: str = "rich"
+    CONVERTER_WARMUP_PROFILES: list = ["rich"]
+
+    CHUNK_SIZE_TOKENS: int = 1000
+    CHUNK_OVERLAP_TOKENS: int = 200
+    CHUNK_TOKENIZER_ENCODING: str = "gpt2"
+
+    SAVE_CONVERSION_ARTIFACTS: bool = True
+
+    PDF_SHARD_MIN_PAGES: int = 100
+    PDF_SHARD_PAGES: int = 25
+
+    CSV_READ_CHUNK_ROWS: int = 50000
+    CSV_CHUNK_MAX_CHARACTERS: int = 1000
+    CHUNK_STREAM_QUEUE_SIZE: int = 2
+
+    TEXT_STREAM_BUFFER_SIZE: int = 1048576  # in characters
+    TEXT_STREAM_BATCH_SIZE: int = 500
+
+    INDEX_PUSH_PAGE_SIZE: int = 500
+
+    EMBEDDING_BATCH_MAX_TEXTS: Optional[int] = None
+    EMBEDDING_BATCH_MAX_TOKENS: Optional[int] = None
+    EMBEDDING_BATCH_CONCURRENCY: int = 4
+    EMBEDDING_BATCH_TOKEN_MARGIN: float = 0.9
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000
+
+    QUERY_EMBEDDING_BATCH_SIZE: int = 32
+    QUERY_EMBEDDING_MAX_WAIT_MS: float = 3.0
+
+    INDEX_PIPELINE_BATCH_SIZE: int = 50
+    INDEX_PIPELINE_QUEUE_SIZE: int = 4
+    INDEX_PIPELINE_EMBED_WORKERS: int = 2
+
+    PROJECT_CACHE_TTL_SECONDS: int = 300
+    PROJECT_CACHE_MAX_SIZE: int = 1024
+
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_STALE_AFTER_SECONDS: int = 1800
+    JOB_HEARTBEAT_INTERVAL_SECONDS: int = 60
 
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_MAIN_DATABASE: str
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 20
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = False
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    POSTGRES_REQUEST_SCOPED_CONNECTION: bool = True
 
     DAFAULT_INPUT_MAX_CHARACTERS: Optional[int] = None
     DAFAULT_OUTPUT_MAX_TOKENS: Optional[int] = None
@@ -27,6 +85,24 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_API_URL: Optional[str] = None
 
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    LLM_HTTP2: bool = True
+
+    LOCAL_EMBEDDING_MODEL_BACKEND: str = "torch"
+    LOCAL_EMBEDDING_DEVICE: str = "cpu"
+    LOCAL_EMBEDDING_THREADS: Optional[int] = None
+    LOCAL_EMBEDDING_QUANTIZE_INT8: bool = False
+    LOCAL_EMBEDDING_ONNX_FILE_NAME: Optional[str] = None
+    LOCAL_EMBEDDING_NORMALIZE: bool = True
+    LOCAL_EMBEDDING_QUERY_PREFIX: str = ""
+    LOCAL_EMBEDDING_DOCUMENT_PREFIX: str = ""
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 32
+    LOCAL_EMBEDDING_MAX_WAIT_MS: float = 5.0
+
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
 
@@ -45,7 +121,9 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
+@lru_cache
 def get_settings():
+    # Parsed once per process, controllers and models ask for the settings on every construction
     return Settings()
 
 # config = get_settings()
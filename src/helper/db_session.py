@@ -0,0 +1,52 @@
+from contextvars import ContextVar
+
+# Connection scope of the request for routes that opt in, see routes.dependencies.use_request_connection
+request_connection: ContextVar = ContextVar("request_connection", default=None)
+
+class RequestConnectionScope:
+    # Checks out one connection on the first session of the request and keeps it until the
+    # request ends. A request that never touches the database never holds one.
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.connection = None
+
+    async def get_connection(self):
+        if self.connection is None:
+            self.connection = await self.engine.connect()
+        return self.connection
+
+    async def close(self):
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+class RequestScopedSession:
+
+    def __init__(self, scope: RequestConnectionScope, session_maker, kwargs: dict):
+        self.scope = scope
+        self.session_maker = session_maker
+        self.kwargs = kwargs
+        self.session = None
+
+    async def __aenter__(self):
+        connection = await self.scope.get_connection()
+        self.session = self.session_maker(bind=connection, **self.kwargs)
+        return await self.session.__aenter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self.session.__aexit__(exc_type, exc, tb)
+
+class RequestScopedSessionMaker:
+    # Stands in for the sessionmaker as db_client, every model opens its sessions with
+    # "async with db_client() as session". Inside an opted-in request the sessions share the
+    # request's connection, anywhere else this behaves exactly like the wrapped sessionmaker.
+
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+
+    def __call__(self, **kwargs):
+        scope = request_connection.get()
+        if scope is None:
+            return self.session_maker(**kwargs)
+        return RequestScopedSession(scope, self.session_maker, kwargs)
@@ -3,15 +3,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from routes.base import base_router
 from routes.upload import upload_router
 from routes.nlp import nlp_router
+from routes.jobs import jobs_router
 from helper import get_settings, Settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
-from utils.metrics import setup_metrics
+from utils.metrics import setup_metrics, setup_db_pool_metrics, InstrumentedAsyncQueuePool
+from helper.db_session import RequestScopedSessionMaker
+from controllers.DocumentConverterPool import DocumentConverterPool, warm_up_converter_pool
+from controllers.ProcessController import shutdown_chunk_stream_manager
+from routes.dependencies import AppContainer
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sentence_transformers import CrossEncoder
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import torch
+import os
 
 app = FastAPI(title="Multi-Model RAG API")
 
@@ -34,13 +42,40 @@ async def startup_span():
     dtype = torch.float16 if device == 'cuda' else torch.float32
 
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-
-    app.db_engine = create_async_engine(postgres_conn)
+    postgres_conn += f"?prepared_statement_cache_size={settings.POSTGRES_STATEMENT_CACHE_SIZE}"
+
+    app.db_engine = create_async_engine(
+        postgres_conn,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING
+    )
+    setup_db_pool_metrics(app.db_engine)
     
-    app.db_client = sessionmaker(
+    app.db_client = RequestScopedSessionMaker(sessionmaker(
         bind=app.db_engine, class_=AsyncSession, expire_on_commit=False
+    ))
+
+    # A bad profile name fails here instead of breaking the process pool initializer
+    DocumentConverterPool.validate_profiles(
+        [settings.DEFAULT_CONVERSION_PROFILE, *settings.CONVERTER_WARMUP_PROFILES]
     )
 
+    # Document conversion runs outside the event loop
+    process_pool_workers = settings.PROCESS_POOL_MAX_WORKERS or os.cpu_count()
+    app.process_pool = ProcessPoolExecutor(
+        max_workers=process_pool_workers,
+        mp_context=multiprocessing.get_context(settings.PROCESS_POOL_START_METHOD),
+        initializer=warm_up_converter_pool,
+        initargs=(settings.CONVERTER_WARMUP_PROFILES,)
+    )
+    # Workers are spawned on demand, start them now so the converters are warm before the first request
+    for _ in range(process_pool_workers):
+        app.process_pool.submit(os.getpid)
+
     llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderFactory(settings, db_client=app.db_client)
 
@@ -69,11 +104,22 @@ async def startup_span():
         trust_remote_code=True,
     )
     app.cross_encoder.to(device)
+
+    # Controllers and models are built once here and handed to routes through Depends
+    app.container = AppContainer(app)
+    app.container.job_controller.start_workers(settings.JOB_WORKERS)
     
 async def shutdown_span():
+    await app.container.job_controller.stop_workers()
+    await app.container.nlp_controller.embedding_batcher.close()
+    app.process_pool.shutdown(wait=False, cancel_futures=True)
+    shutdown_chunk_stream_manager()
     await app.db_engine.dispose()
     await app.vectordb_client.disconnect()
     await app.vectordb_client.cache_disconnect()
+    await app.generation_client.aclose()
+    if app.embedding_client is not app.generation_client:
+        await app.embedding_client.aclose()
 
 
 app.on_event("startup")(startup_span)
@@ -82,6 +128,7 @@ app.on_event("shutdown")(shutdown_span)
 app.include_router(base_router)
 app.include_router(upload_router)
 app.include_router(nlp_router)
+app.include_router(jobs_router)
 
 
 # uvicorn main:app --reload --port 8001
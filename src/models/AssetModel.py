@@ -1,6 +1,8 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Asset
 from sqlalchemy.future import select
+from sqlalchemy import update, insert, func, cast
+from sqlalchemy.dialects.postgresql import JSONB
 
 class AssetModel(BaseDataModel):
     
@@ -15,6 +17,19 @@ class AssetModel(BaseDataModel):
             await session.refresh(asset)
         return asset
     
+    async def create_many_assets(self, assets: list):
+        # One INSERT ... RETURNING for the whole batch instead of a transaction per asset
+        if not assets:
+            return []
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = insert(Asset).returning(
+                    Asset.asset_id, Asset.asset_name, sort_by_parameter_order=True
+                )
+                result = await session.execute(query, assets)
+                return result.all()
+
     async def get_all_project_assets(self, asset_project_id: str, asset_type: str):
         async with self.db_client() as session:
             stmt = select(Asset).where(
@@ -35,4 +50,54 @@ class AssetModel(BaseDataModel):
                 result = await session.execute(query) 
                 result = result.scalar_one_or_none()
                 return result
-    
+
+    async def get_asset_by_hash(self, asset_project_id: str, asset_hash: str):
+        async with self.db_client() as session:
+            query = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_hash == asset_hash
+            ).order_by(Asset.asset_id).limit(1)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    async def update_asset_config(self, asset_id: int, asset_config: dict):
+        # Merged into the stored config so keys written at upload time are kept
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Asset).where(
+                    Asset.asset_id == asset_id
+                ).values(
+                    asset_config=func.coalesce(Asset.asset_config, cast({}, JSONB)).op("||")(cast(asset_config, JSONB))
+                )
+                result = await session.execute(query)
+        return result.rowcount > 0
+
+    async def update_asset_content(self, asset_id: int, asset_hash: str, asset_size: int):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Asset).where(
+                    Asset.asset_id == asset_id
+                ).values(
+                    asset_hash=asset_hash,
+                    asset_size=asset_size
+                )
+                result = await session.execute(query)
+        return result.rowcount > 0
+
+    async def get_assets_by_hashes(self, asset_project_id: str, asset_hashes: list):
+        async with self.db_client() as session:
+            query = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_hash.in_(asset_hashes)
+            ).order_by(Asset.asset_id)
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    async def get_assets_by_ids(self, asset_project_id: str, asset_ids: list):
+        async with self.db_client() as session:
+            query = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_id.in_(asset_ids)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
@@ -1,7 +1,7 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import DataChunk
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update, insert
 from typing import List
 
 class ChunkModel(BaseDataModel):
@@ -25,15 +25,19 @@ class ChunkModel(BaseDataModel):
                 chunk = chunk.scalar_one_or_none()
                 return chunk
     
-    async def insert_many_chunks(self, chunks: List[DataChunk], batch_size: int=100):
-        async with self.db_client() as session: 
+    async def insert_many_chunks(self, chunks: List[dict], batch_size: int=1000):
+        # chunks are plain column dicts, no ORM objects are built. Every batch is sent as one
+        # multi-row INSERT ... RETURNING, the new chunk ids come back in the order of chunks.
+        chunk_ids = []
+        query = insert(DataChunk).returning(DataChunk.chunk_id, sort_by_parameter_order=True)
+
+        async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(chunks), batch_size):
-                    batch = chunks[i:i+batch_size]
-                    session.add_all(batch)
-            await session.commit()
-        
-        return len(chunks)
+                    result = await session.execute(query, chunks[i:i+batch_size])
+                    chunk_ids.extend(result.scalars().all())
+
+        return chunk_ids
     
     
     async def delete_chunks_by_project_id(self, project_id: str):
@@ -45,10 +49,35 @@ class ChunkModel(BaseDataModel):
     
     async def get_poject_chunks(self, project_id: str, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
-            query = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page_no - 1) * page_size).limit(page_size)
+            query = select(DataChunk).where(DataChunk.chunk_project_id == project_id).order_by(DataChunk.chunk_id).offset((page_no - 1) * page_size).limit(page_size)
             result = await session.execute(query)
             records = result.scalars().all()
         return records
+
+    async def iter_project_chunks(self, project_id: str, page_size: int=500):
+        # Keyset pagination on (chunk_project_id, chunk_id): every page is an index range scan
+        # starting after the last id seen, so the cost per page does not grow with the position
+        last_chunk_id = 0
+        while True:
+            async with self.db_client() as session:
+                query = select(
+                    DataChunk.chunk_id, DataChunk.chunk_text, DataChunk.chunk_metadata
+                ).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id
+                ).order_by(DataChunk.chunk_id).limit(page_size)
+                result = await session.execute(query)
+                records = result.all()
+
+            if not records:
+                return
+
+            yield records
+
+            if len(records) < page_size:
+                return
+
+            last_chunk_id = records[-1].chunk_id
     
     async def get_total_chunks_count(self, project_id: str):
         total_count = 0
@@ -58,4 +87,42 @@ class ChunkModel(BaseDataModel):
             total_count = records_count.scalar()
         
         return total_count
-    
+
+    async def get_chunked_asset_ids(self, project_id: str):
+        async with self.db_client() as session:
+            query = select(DataChunk.chunk_asset_id).where(DataChunk.chunk_project_id == project_id).distinct()
+            result = await session.execute(query)
+            records = result.scalars().all()
+        return set(records)
+
+    async def get_asset_chunk_hashes(self, project_id: int, asset_id: int):
+        async with self.db_client() as session:
+            query = select(DataChunk.chunk_id, DataChunk.chunk_hash, DataChunk.chunk_order).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_asset_id == asset_id
+            ).order_by(DataChunk.chunk_order)
+            result = await session.execute(query)
+            records = result.all()
+        return records
+
+    async def delete_chunks_by_ids(self, project_id: int, chunk_ids: List[int]):
+        # Filtering on the project lets postgres prune the delete to one partition
+        if not chunk_ids:
+            return 0
+        async with self.db_client() as session:
+            query = delete(DataChunk).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_id.in_(chunk_ids)
+            )
+            result = await session.execute(query)
+            await session.commit()
+        return result.rowcount
+
+    async def update_chunks_order(self, chunks_order: List[dict]):
+        # chunks_order: [{"chunk_id": ..., "chunk_project_id": ..., "chunk_order": ...}], bulk UPDATE by primary key
+        if not chunks_order:
+            return 0
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(update(DataChunk), chunks_order)
+        return len(chunks_order)
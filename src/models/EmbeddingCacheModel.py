@@ -0,0 +1,101 @@
+from .BaseDataModel import BaseDataModel
+from helper import get_settings
+from .db_schemes import EmbeddingCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from array import array
+
+class EmbeddingCacheModel(BaseDataModel):
+    # Embeddings keyed by (provider embedding fingerprint, document/query type, sha256 of the text). Each worker keeps
+    # the most recently used packed vectors in front of the table, so repeated queries skip the database too.
+
+    _lru_cache = {}
+
+    def __init__(self, db_client):
+        super().__init__(db_client)
+
+    @staticmethod
+    def pack_vector(vector: list) -> bytes:
+        return array('f', vector).tobytes()
+
+    @staticmethod
+    def unpack_vector(packed: bytes) -> list:
+        vector = array('f')
+        vector.frombytes(packed)
+        return vector.tolist()
+
+    @classmethod
+    def cache_packed(cls, key: tuple, packed: bytes):
+
+        cls._lru_cache.pop(key, None)
+        cls._lru_cache[key] = packed
+
+        # Least recently used entries go first once the cache is full
+        max_size = get_settings().EMBEDDING_CACHE_LRU_SIZE
+        while len(cls._lru_cache) > max_size:
+            cls._lru_cache.pop(next(iter(cls._lru_cache)))
+
+    async def get_embeddings(self, embedding_model_id: str, embedding_type: str, text_hashes: list):
+        # Returns {text_hash: vector} for the hashes found, in memory first then in one query
+
+        found = {}
+        missing = []
+        for text_hash in text_hashes:
+            key = (embedding_model_id, embedding_type, text_hash)
+            packed = self._lru_cache.get(key)
+            if packed is None:
+                missing.append(text_hash)
+                continue
+
+            self.cache_packed(key, packed)
+            found[text_hash] = self.unpack_vector(packed)
+
+        if not missing:
+            return found
+
+        async with self.db_client() as session:
+            query = select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).where(
+                EmbeddingCacheEntry.embedding_model_id == embedding_model_id,
+                EmbeddingCacheEntry.embedding_type == embedding_type,
+                EmbeddingCacheEntry.text_hash.in_(missing)
+            )
+            result = await session.execute(query)
+            rows = result.all()
+
+        for text_hash, packed in rows:
+            self.cache_packed((embedding_model_id, embedding_type, text_hash), packed)
+            found[text_hash] = self.unpack_vector(packed)
+
+        return found
+
+    async def insert_embeddings(self, embedding_model_id: str, embedding_type: str, embeddings: dict, batch_size: int=1000):
+        # embeddings is {text_hash: vector}, rows another worker stored first are kept as they are
+
+        if not embeddings:
+            return 0
+
+        rows = []
+        for text_hash, vector in embeddings.items():
+            packed = self.pack_vector(vector)
+            self.cache_packed((embedding_model_id, embedding_type, text_hash), packed)
+            rows.append({
+                "embedding_model_id": embedding_model_id,
+                "embedding_type": embedding_type,
+                "text_hash": text_hash,
+                "embedding": packed
+            })
+
+        query = insert(EmbeddingCacheEntry).on_conflict_do_nothing(
+            index_elements=[
+                EmbeddingCacheEntry.embedding_model_id,
+                EmbeddingCacheEntry.embedding_type,
+                EmbeddingCacheEntry.text_hash
+            ]
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(rows), batch_size):
+                    await session.execute(query, rows[i:i+batch_size])
+
+        return len(rows)
@@ -0,0 +1,112 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import IngestionJob
+from .enums.JobEnums import JobStatusEnum
+from sqlalchemy.future import select
+from sqlalchemy import update, func, or_, and_
+from datetime import datetime, timedelta, timezone
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client):
+        super().__init__(db_client)
+
+    async def create_job(self, job: IngestionJob):
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int):
+        async with self.db_client() as session:
+            query = select(IngestionJob).where(IngestionJob.job_id == job_id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    async def claim_next_job(self, stale_after_seconds: int):
+        # Running jobs whose heartbeat stopped belong to a dead worker and are picked up again
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                next_job_id = select(IngestionJob.job_id).where(
+                    or_(
+                        IngestionJob.job_status == JobStatusEnum.QUEUED.value,
+                        and_(
+                            IngestionJob.job_status == JobStatusEnum.RUNNING.value,
+                            IngestionJob.updated_at < stale_before
+                        )
+                    )
+                ).order_by(IngestionJob.job_id).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+
+                query = update(IngestionJob).where(
+                    IngestionJob.job_id == next_job_id
+                ).values(
+                    job_status=JobStatusEnum.RUNNING.value,
+                    started_at=func.now()
+                ).returning(IngestionJob)
+
+                result = await session.execute(query)
+                return result.scalars().first()
+
+    async def update_job_progress(self, job_id: int, done: int, total: int, chunks: int):
+        # Returns False once the job is no longer running, e.g. it was cancelled
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(IngestionJob).where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.job_status == JobStatusEnum.RUNNING.value
+                ).values(
+                    job_done=done,
+                    job_total=total,
+                    job_chunks=chunks
+                ).returning(IngestionJob.job_id)
+
+                result = await session.execute(query)
+                return result.scalar_one_or_none() is not None
+
+    async def touch_job(self, job_id: int):
+        # Heartbeat of a running job, returns False once it is no longer running
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(IngestionJob).where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.job_status == JobStatusEnum.RUNNING.value
+                ).values(
+                    updated_at=func.now()
+                ).returning(IngestionJob.job_id)
+
+                result = await session.execute(query)
+                return result.scalar_one_or_none() is not None
+
+    async def finish_job(self, job_id: int, job_status: str, job_result: dict = None, job_error: str = None):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(IngestionJob).where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.job_status == JobStatusEnum.RUNNING.value
+                ).values(
+                    job_status=job_status,
+                    job_result=job_result,
+                    job_error=job_error,
+                    finished_at=func.now()
+                )
+                result = await session.execute(query)
+        return result.rowcount > 0
+
+    async def cancel_job(self, job_id: int):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(IngestionJob).where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.job_status.in_([
+                        JobStatusEnum.QUEUED.value,
+                        JobStatusEnum.RUNNING.value
+                    ])
+                ).values(
+                    job_status=JobStatusEnum.CANCELLED.value,
+                    finished_at=func.now()
+                )
+                result = await session.execute(query)
+        return result.rowcount > 0
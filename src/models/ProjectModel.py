@@ -1,10 +1,19 @@
 from .BaseDataModel import BaseDataModel
+from helper import get_settings
 from .db_schemes import Project
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+import time
 
 class ProjectModel(BaseDataModel):
-    
+    # Project rows never change after creation, so each worker keeps the ones it has seen for
+    # PROJECT_CACHE_TTL_SECONDS and most requests resolve their project without a query.
+    # Cached rows are detached, only their column attributes may be used. The one exception is
+    # project_index_incomplete, it is always read through is_index_incomplete.
+
+    _project_cache = {}
+
     def __init__(self, db_client):
         super().__init__(db_client)
 
@@ -19,19 +28,61 @@ class ProjectModel(BaseDataModel):
     
     async def get_project_or_create_one(self, project_id: str):
 
+        cached = self._project_cache.get(project_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # The INSERT ... ON CONFLICT DO NOTHING always runs first on a cache miss, so a concurrent
+        # creator never fails on the primary key. It returns no row when the project already
+        # exists, and only then does the SELECT run to read it.
         async with self.db_client() as session:
             async with session.begin():
-                query = select(Project).where(Project.project_id == project_id)
+                query = insert(Project).values(
+                    project_id = project_id
+                ).on_conflict_do_nothing(
+                    index_elements = [Project.project_id]
+                ).returning(Project)
                 result = await session.execute(query)
                 project = result.scalar_one_or_none()
+
                 if project is None:
-                    project_rec = Project(
-                        project_id = project_id
-                    )
-                    project = await self.create_project(project=project_rec)
-                    return project
-                else:
-                    return project
+                    query = select(Project).where(Project.project_id == project_id)
+                    result = await session.execute(query)
+                    project = result.scalar_one()
+
+        self.cache_project(project)
+        return project
+
+    async def is_index_incomplete(self, project_id: str):
+        async with self.db_client() as session:
+            query = select(Project.project_index_incomplete).where(Project.project_id == project_id)
+            result = await session.execute(query)
+            return bool(result.scalar_one_or_none())
+
+    async def set_index_incomplete(self, project_id: str, index_incomplete: bool):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = update(Project).where(
+                    Project.project_id == project_id
+                ).values(
+                    project_index_incomplete = index_incomplete
+                )
+                result = await session.execute(query)
+        return result.rowcount > 0
+
+    @classmethod
+    def cache_project(cls, project: Project):
+
+        settings = get_settings()
+
+        cls._project_cache.pop(project.project_id, None)
+        cls._project_cache[project.project_id] = (
+            time.monotonic() + settings.PROJECT_CACHE_TTL_SECONDS, project
+        )
+
+        # Oldest entries go first once the cache is full
+        while len(cls._project_cache) > settings.PROJECT_CACHE_MAX_SIZE:
+            cls._project_cache.pop(next(iter(cls._project_cache)))
     
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
@@ -1,3 +1,5 @@
 from .enums.ResponseEnumeration import ResponseEnumeration
 from .enums.ProcessingEnums import ProcessingEnums
 from .enums.AssetTypeEnum import AssetTypeEnum
+from .enums.ConversionProfileEnum import ConversionProfileEnum
+from .enums.JobEnums import JobTypeEnum, JobStatusEnum
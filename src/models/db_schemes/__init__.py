@@ -1 +1 @@
-from .miniragdb.schemes import Project, Asset, DataChunk, RetrievedDocument
\ No newline at end of file
+from .miniragdb.schemes import Project, Asset, DataChunk, RetrievedDocument, IngestionJob, EmbeddingCacheEntry
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Add embedding cache
+
+Revision ID: a3e8d6b2c7f1
+Revises: f2a7c4e9b613
+Create Date: 2026-10-17 17:02:18.264731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e8d6b2c7f1'
+down_revision: Union[str, Sequence[str], None] = 'f2a7c4e9b613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embedding_cache',
+    sa.Column('embedding_model_id', sa.String(), nullable=False),
+    sa.Column('embedding_type', sa.String(), nullable=False),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('embedding', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('embedding_model_id', 'embedding_type', 'text_hash')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('embedding_cache')
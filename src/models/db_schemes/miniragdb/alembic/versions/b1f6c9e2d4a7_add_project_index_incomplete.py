@@ -0,0 +1,27 @@
+"""Add project index incomplete
+
+Revision ID: b1f6c9e2d4a7
+Revises: a3e8d6b2c7f1
+Create Date: 2026-10-17 21:14:52.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f6c9e2d4a7'
+down_revision: Union[str, Sequence[str], None] = 'a3e8d6b2c7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('project_index_incomplete', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'project_index_incomplete')
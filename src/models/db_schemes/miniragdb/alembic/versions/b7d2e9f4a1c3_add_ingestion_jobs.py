@@ -0,0 +1,51 @@
+"""Add ingestion jobs
+
+Revision ID: b7d2e9f4a1c3
+Revises: 492350574020
+Create Date: 2026-10-17 10:12:41.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9f4a1c3'
+down_revision: Union[str, Sequence[str], None] = '492350574020'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ingestion_jobs',
+    sa.Column('job_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('job_uuid', sa.UUID(), nullable=False),
+    sa.Column('job_type', sa.String(), nullable=False),
+    sa.Column('job_status', sa.String(), nullable=False),
+    sa.Column('job_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('job_total', sa.Integer(), nullable=False),
+    sa.Column('job_done', sa.Integer(), nullable=False),
+    sa.Column('job_chunks', sa.Integer(), nullable=False),
+    sa.Column('job_result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('job_error', sa.String(), nullable=True),
+    sa.Column('job_project_id', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_project_id'], ['projects.project_id'], ),
+    sa.PrimaryKeyConstraint('job_id'),
+    sa.UniqueConstraint('job_uuid')
+    )
+    op.create_index('ix_ingestion_job_status', 'ingestion_jobs', ['job_status', 'job_id'], unique=False)
+    op.create_index('ix_ingestion_job_project_id', 'ingestion_jobs', ['job_project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ingestion_job_project_id', table_name='ingestion_jobs')
+    op.drop_index('ix_ingestion_job_status', table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
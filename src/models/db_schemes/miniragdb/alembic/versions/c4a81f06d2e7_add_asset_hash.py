@@ -0,0 +1,29 @@
+"""Add asset hash
+
+Revision ID: c4a81f06d2e7
+Revises: b7d2e9f4a1c3
+Create Date: 2026-10-17 11:03:27.116954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a81f06d2e7'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e9f4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('assets', sa.Column('asset_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_asset_project_hash', 'assets', ['asset_project_id', 'asset_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_asset_project_hash', table_name='assets')
+    op.drop_column('assets', 'asset_hash')
@@ -0,0 +1,29 @@
+"""Add chunk hash
+
+Revision ID: d91f3b7c5a20
+Revises: c4a81f06d2e7
+Create Date: 2026-10-17 11:48:05.672140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f3b7c5a20'
+down_revision: Union[str, Sequence[str], None] = 'c4a81f06d2e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chunks', sa.Column('chunk_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_chunk_asset_hash', 'chunks', ['chunk_asset_id', 'chunk_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunk_asset_hash', table_name='chunks')
+    op.drop_column('chunks', 'chunk_hash')
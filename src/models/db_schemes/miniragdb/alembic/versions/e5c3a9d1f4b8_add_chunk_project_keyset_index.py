@@ -0,0 +1,29 @@
+"""Add chunk project keyset index
+
+Revision ID: e5c3a9d1f4b8
+Revises: d91f3b7c5a20
+Create Date: 2026-10-17 14:02:31.218904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c3a9d1f4b8'
+down_revision: Union[str, Sequence[str], None] = 'd91f3b7c5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+    op.drop_index('ix_chunk_project_id', table_name='chunks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_chunk_project_id', 'chunks', ['chunk_project_id'], unique=False)
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='chunks')
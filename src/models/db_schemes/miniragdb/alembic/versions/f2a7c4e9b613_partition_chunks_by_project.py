@@ -0,0 +1,116 @@
+"""Partition chunks by project
+
+Revision ID: f2a7c4e9b613
+Revises: e5c3a9d1f4b8
+Create Date: 2026-10-17 15:26:47.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c4e9b613'
+down_revision: Union[str, Sequence[str], None] = 'e5c3a9d1f4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHUNK_PARTITIONS = 16
+
+CHUNK_COLUMNS = (
+    "chunk_id, chunk_uuid, chunk_text, chunk_metadata, chunk_order, chunk_hash, "
+    "chunk_project_id, chunk_asset_id, created_at, updated_at"
+)
+
+
+def chunk_columns():
+    # chunk_id keeps drawing from the original sequence, ids stay unique across the swap
+    return [
+        sa.Column('chunk_id', sa.Integer(), server_default=sa.text("nextval('chunks_chunk_id_seq')"), nullable=False),
+        sa.Column('chunk_uuid', sa.UUID(), nullable=False),
+        sa.Column('chunk_text', sa.String(), nullable=False),
+        sa.Column('chunk_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('chunk_order', sa.Integer(), nullable=False),
+        sa.Column('chunk_hash', sa.String(length=64), nullable=True),
+        sa.Column('chunk_project_id', sa.Integer(), nullable=False),
+        sa.Column('chunk_asset_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['chunk_asset_id'], ['assets.asset_id'], ),
+        sa.ForeignKeyConstraint(['chunk_project_id'], ['projects.project_id'], ),
+    ]
+
+
+def create_chunk_indexes():
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+    op.create_index('ix_chunk_asset_id', 'chunks', ['chunk_asset_id'], unique=False)
+    op.create_index('ix_chunk_asset_hash', 'chunks', ['chunk_asset_id', 'chunk_hash'], unique=False)
+
+
+def move_chunks_aside(old_table: str, unique_constraint: str):
+    # Frees the table, constraint and index names for the new chunks table
+    op.execute(f"ALTER TABLE chunks RENAME TO {old_table}")
+    op.execute(f"ALTER TABLE {old_table} RENAME CONSTRAINT chunks_pkey TO {old_table}_pkey")
+    op.execute(f"ALTER TABLE {old_table} RENAME CONSTRAINT {unique_constraint} TO {old_table}_uuid_key")
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name=old_table)
+    op.drop_index('ix_chunk_asset_id', table_name=old_table)
+    op.drop_index('ix_chunk_asset_hash', table_name=old_table)
+    op.execute("ALTER SEQUENCE chunks_chunk_id_seq OWNED BY NONE")
+
+
+def copy_chunks_from(old_table: str):
+    op.execute(f"INSERT INTO chunks ({CHUNK_COLUMNS}) SELECT {CHUNK_COLUMNS} FROM {old_table}")
+    op.execute("ALTER SEQUENCE chunks_chunk_id_seq OWNED BY chunks.chunk_id")
+    op.drop_table(old_table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pgvector collections reference chunks(chunk_id), which can not stay unique on its own
+    # once chunk_project_id is part of the primary key
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT conrelid::regclass AS table_name, conname FROM pg_constraint
+                     WHERE contype = 'f' AND confrelid = 'chunks'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', r.table_name, r.conname);
+            END LOOP;
+        END $$;
+    """)
+
+    move_chunks_aside('chunks_unpartitioned', 'chunks_chunk_uuid_key')
+
+    op.create_table('chunks',
+    *chunk_columns(),
+    sa.PrimaryKeyConstraint('chunk_id', 'chunk_project_id'),
+    sa.UniqueConstraint('chunk_uuid', 'chunk_project_id'),
+    postgresql_partition_by='HASH (chunk_project_id)'
+    )
+
+    for remainder in range(CHUNK_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE chunks_p{remainder} PARTITION OF chunks "
+            f"FOR VALUES WITH (MODULUS {CHUNK_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    create_chunk_indexes()
+    copy_chunks_from('chunks_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Foreign keys dropped from pgvector collections by upgrade() are not restored
+    move_chunks_aside('chunks_partitioned', 'chunks_chunk_uuid_chunk_project_id_key')
+
+    op.create_table('chunks',
+    *chunk_columns(),
+    sa.PrimaryKeyConstraint('chunk_id'),
+    sa.UniqueConstraint('chunk_uuid')
+    )
+
+    create_chunk_indexes()
+    copy_chunks_from('chunks_partitioned')
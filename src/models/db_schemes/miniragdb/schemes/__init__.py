@@ -2,4 +2,6 @@ from .minirag_base import SQLAlchemyBase
 from .project import Project
 from .asset import Asset
 from .datachunk import DataChunk, RetrievedDocument
+from .ingestion_job import IngestionJob
+from .embedding_cache import EmbeddingCacheEntry
  
@@ -1,5 +1,5 @@
 from .minirag_base import SQLAlchemyBase
-from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, Index
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
@@ -9,14 +9,17 @@ class DataChunk(SQLAlchemyBase):
 
     __tablename__ = "chunks"
 
+    # chunks is hash-partitioned by chunk_project_id, the partition key has to be part of the
+    # primary key and of every unique constraint. chunk_id alone is still unique (one sequence).
     chunk_id = Column(Integer, primary_key=True, autoincrement=True)
-    chunk_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    chunk_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, nullable=False)
 
     chunk_text = Column(String, nullable=False)
     chunk_metadata = Column(JSONB, nullable=True)
     chunk_order = Column(Integer, nullable=False)
+    chunk_hash = Column(String(64), nullable=True)
 
-    chunk_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)
+    chunk_project_id = Column(Integer, ForeignKey("projects.project_id"), primary_key=True, nullable=False)
     chunk_asset_id = Column(Integer, ForeignKey("assets.asset_id"), nullable=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -27,8 +30,12 @@ class DataChunk(SQLAlchemyBase):
     asset = relationship("Asset", back_populates="chunks")
 
     __table_args__ = (
-        Index('ix_chunk_project_id', chunk_project_id),
+        UniqueConstraint(chunk_uuid, chunk_project_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_asset_hash', chunk_asset_id, chunk_hash),
+        # Partitions are created by the alembic migration
+        {"postgresql_partition_by": "HASH (chunk_project_id)"},
     )
 
 class RetrievedDocument(BaseModel):
@@ -0,0 +1,15 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, DateTime, func, String, LargeBinary
+
+class EmbeddingCacheEntry(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    embedding_model_id = Column(String, primary_key=True)
+    embedding_type = Column(String, primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+
+    # float32 values packed with array('f'), a quarter of the size of a JSON list of floats
+    embedding = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,39 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+import uuid
+
+class IngestionJob(SQLAlchemyBase):
+
+    __tablename__ = "ingestion_jobs"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    job_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+
+    job_type = Column(String, nullable=False)
+    job_status = Column(String, nullable=False)
+    job_payload = Column(JSONB, nullable=True)
+
+    job_total = Column(Integer, nullable=False, default=0)
+    job_done = Column(Integer, nullable=False, default=0)
+    job_chunks = Column(Integer, nullable=False, default=0)
+
+    job_result = Column(JSONB, nullable=True)
+    job_error = Column(String, nullable=True)
+
+    job_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+
+    project = relationship("Project", back_populates="jobs")
+
+
+    __table_args__ = (
+        Index('ix_ingestion_job_status', job_status, job_id),
+        Index('ix_ingestion_job_project_id', job_project_id),
+    )
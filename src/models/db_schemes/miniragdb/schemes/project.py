@@ -1,5 +1,5 @@
 from .minirag_base import SQLAlchemyBase
-from sqlalchemy import Column, Integer, DateTime, func
+from sqlalchemy import Column, Integer, DateTime, Boolean, func, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -11,11 +11,15 @@ class Project(SQLAlchemyBase):
     project_id = Column(Integer, primary_key=True, autoincrement=True)
     project_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
 
+    # Set while the vector db may be missing some of the project's chunks, cleared once it holds them all
+    project_index_incomplete = Column(Boolean, server_default=false(), nullable=False)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
     chunks = relationship("DataChunk", back_populates="project")
     assets = relationship("Asset", back_populates="project")
+    jobs = relationship("IngestionJob", back_populates="project")
 
 
 
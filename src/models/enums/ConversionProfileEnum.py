@@ -0,0 +1,6 @@
+from enum import Enum
+
+class ConversionProfileEnum(Enum):
+    FAST = "fast"
+    STANDARD = "standard"
+    RICH = "rich"
@@ -0,0 +1,12 @@
+from enum import Enum
+
+class JobTypeEnum(Enum):
+    PROCESS = "process"
+    INDEX = "index"
+
+class JobStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
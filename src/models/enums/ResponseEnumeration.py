@@ -3,10 +3,22 @@ class ResponseEnumeration(Enum):
     FILE_VALIDATION_SUCCESS = "File validation successful."
     FILE_UPLOADED_SUCCESS = "File uploaded successfully."
     FILE_UPLOAD_FAILED = "File upload failed."
+    FILE_ALREADY_UPLOADED = "File already uploaded."
+    FILE_REPLACED_SUCCESS = "file_replaced_success"
     INVALID_FILE_TYPE = "File type {file_type} is not allowed."
     FILE_TOO_LARGE = "File size exceeds the maximum limit of {file_size} MB."
     FILE_NOT_EXIST = "The file {file_path} does not exist."
     FILE_EXIST = "The file {file_path} already exists."
+    FILES_UPLOADED_SUCCESS = "files_uploaded_success"
+    NO_FILES_UPLOADED = "no_files_uploaded"
+    UPLOAD_FIELDS_INVALID = "upload_fields_invalid"
+    UPLOAD_SESSION_CREATED = "upload_session_created"
+    UPLOAD_SESSION_RETRIEVED = "upload_session_retrieved"
+    UPLOAD_SESSION_NOT_FOUND = "upload_session_not_found"
+    UPLOAD_PART_RECEIVED = "upload_part_received"
+    UPLOAD_PART_INVALID = "upload_part_invalid"
+    UPLOAD_INCOMPLETE = "upload_incomplete"
+    UPLOAD_CHECKSUM_MISMATCH = "upload_checksum_mismatch"
     PROJECT_NOT_FOUND_ERROR = "project_not_found"
     INSERT_INTO_VECTORDB_ERROR = "insert_into_vectordb_error"
     INSERT_INTO_VECTORDB_SUCCESS = "insert_into_vectordb_success"
@@ -23,6 +35,12 @@ class ResponseEnumeration(Enum):
     PROCESSING_FAILED = "processing_failed"
     NO_FILES_ERROR = "not_found_files"
     FILE_ID_ERROR = "no_file_found_with_this_id"
+    CONVERSION_PROFILE_ERROR = "conversion_profile_not_supported"
+    JOB_QUEUED = "job_queued"
+    JOB_RETRIEVED = "job_retrieved"
+    JOB_NOT_FOUND = "job_not_found"
+    JOB_CANCELLED = "job_cancelled"
+    JOB_CANCEL_FAILED = "job_cancel_failed"
 
 
 
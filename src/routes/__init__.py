@@ -1,2 +1,2 @@
 from .schemes.data import ProcessRequest
-from .schemes.upload_request import UploadRequest
\ No newline at end of file
+from .schemes.upload_request import UploadBatchRequest, UploadSessionRequest, UploadCompleteRequest
\ No newline at end of file
@@ -0,0 +1,76 @@
+from fastapi import Request
+from helper.config import get_settings
+from helper.db_session import request_connection, RequestConnectionScope
+from controllers import NLPController, IngestionController, JobController
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.ChunkModel import ChunkModel
+from models.JobModel import JobModel
+
+class AppContainer:
+    # Built once at startup. Controllers and models only hold shared clients, so a single
+    # instance serves every request instead of being rebuilt by each route.
+
+    def __init__(self, app):
+
+        self.db_client = app.db_client
+
+        self.nlp_controller = NLPController(
+            vector_db_client=app.vectordb_client,
+            cross_encoder=app.cross_encoder,
+            embedding_client=app.embedding_client,
+            generation_client=app.generation_client,
+            template_parser=app.template_parser,
+            db_client=app.db_client
+        )
+
+        self.ingestion_controller = IngestionController(
+            db_client=app.db_client,
+            process_pool=app.process_pool,
+            nlp_controller=self.nlp_controller
+        )
+
+        self.project_model = ProjectModel(db_client=app.db_client)
+        self.asset_model = AssetModel(db_client=app.db_client)
+        self.chunk_model = ChunkModel(db_client=app.db_client)
+        self.job_model = JobModel(db_client=app.db_client)
+
+        self.job_controller = JobController(app)
+
+
+async def use_request_connection(request: Request):
+    # Only for routes that run their queries one after another, since one asyncpg connection can
+    # not serve concurrent queries, and that make no LLM or embedding calls, since the connection
+    # stays checked out until the response is ready
+    if not get_settings().POSTGRES_REQUEST_SCOPED_CONNECTION:
+        yield None
+        return
+
+    scope = RequestConnectionScope(engine=request.app.db_engine)
+    token = request_connection.set(scope)
+    try:
+        yield scope
+    finally:
+        request_connection.reset(token)
+        await scope.close()
+
+def get_container(request: Request) -> AppContainer:
+    return request.app.container
+
+def get_nlp_controller(request: Request) -> NLPController:
+    return request.app.container.nlp_controller
+
+def get_ingestion_controller(request: Request) -> IngestionController:
+    return request.app.container.ingestion_controller
+
+def get_job_controller(request: Request) -> JobController:
+    return request.app.container.job_controller
+
+def get_project_model(request: Request) -> ProjectModel:
+    return request.app.container.project_model
+
+def get_asset_model(request: Request) -> AssetModel:
+    return request.app.container.asset_model
+
+def get_job_model(request: Request) -> JobModel:
+    return request.app.container.job_model
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from models import ResponseEnumeration
+from models.JobModel import JobModel
+from controllers import JobController
+from routes.dependencies import get_job_model, get_job_controller, use_request_connection
+
+jobs_router = APIRouter(
+    prefix="/api/v1",
+    tags=["multimodel-rag"]
+)
+
+@jobs_router.get("/jobs/{job_id}", dependencies=[Depends(use_request_connection)])
+async def get_job_status(job_id: int,
+                         job_model: JobModel = Depends(get_job_model),
+                         job_controller: JobController = Depends(get_job_controller)):
+
+    job = await job_model.get_job(job_id=job_id)
+
+    if not job:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "signal": ResponseEnumeration.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "signal": ResponseEnumeration.JOB_RETRIEVED.value,
+            "job": job_controller.get_job_progress(job=job)
+        }
+    )
+
+@jobs_router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: int, job_model: JobModel = Depends(get_job_model)):
+
+    job = await job_model.get_job(job_id=job_id)
+
+    if not job:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "signal": ResponseEnumeration.JOB_NOT_FOUND.value
+            }
+        )
+
+    is_cancelled = await job_model.cancel_job(job_id=job_id)
+
+    if not is_cancelled:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "signal": ResponseEnumeration.JOB_CANCEL_FAILED.value,
+                "status": job.job_status
+            }
+        )
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "signal": ResponseEnumeration.JOB_CANCELLED.value,
+            "job_id": job_id
+        }
+    )
@@ -1,12 +1,12 @@
-from tqdm.auto import tqdm
 from logger import logger
 from fastapi.responses import JSONResponse
-from controllers import NLPController
-from models import ResponseEnumeration
-from models.ChunkModel import ChunkModel
+from controllers import NLPController, IngestionController, JobController
+from models import ResponseEnumeration, JobTypeEnum
 from models.ProjectModel import ProjectModel
 from routes.schemes.nlp import PushRequest, SearchRequest
-from fastapi import APIRouter, Request
+from routes.dependencies import get_nlp_controller, get_ingestion_controller, get_job_controller, get_project_model
+from routes.dependencies import use_request_connection
+from fastapi import APIRouter, Depends
 
 nlp_router = APIRouter(
     prefix="/api/v1",
@@ -14,14 +14,11 @@ nlp_router = APIRouter(
 )
 
 @nlp_router.post("/index/push/{project_id}")
-async def index_project(request: Request, project_id: int, push_request: PushRequest):
+async def index_project(project_id: int, push_request: PushRequest,
+                        project_model: ProjectModel = Depends(get_project_model),
+                        ingestion_controller: IngestionController = Depends(get_ingestion_controller),
+                        job_controller: JobController = Depends(get_job_controller)):
 
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
-    )
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -32,96 +29,49 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
             }
         )
 
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vectordb_client,
-        cross_encoder=request.app.cross_encoder,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser
-    )
-
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
+    if push_request.run_in_background:
+        job = await job_controller.enqueue_job(
+            project_id=project.project_id,
+            job_type=JobTypeEnum.INDEX.value,
+            job_payload=push_request.model_dump(exclude={"run_in_background"})
+        )
 
-    collection_name = nlp_controller.create_collection_name(
-        project_id=project.project_id)
-    
-    cache_name = nlp_controller.create_cache_name(
-        project_id=project.project_id
-    )
+        return JSONResponse(
+            status_code=202,
+            content={
+                "signal": ResponseEnumeration.JOB_QUEUED.value,
+                "job_id": job.job_id
+            }
+        )
 
-    _ = await request.app.vectordb_client.create_collection(
-        collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset
-    )
-    
-    _ = await request.app.vectordb_client.create_cache_collection(
-        cache_name=cache_name,
-        embedding_size=request.app.embedding_client.embedding_size,
+    result = await ingestion_controller.index_project(
+        project=project,
         do_reset=push_request.do_reset
     )
 
-    total_chunks_count = await chunk_model.get_total_chunks_count(
-        project_id=project.project_id
-    )
-    pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
-
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-
-        chunks_ids = [c.chunk_id for c in page_chunks]
-        idx += len(page_chunks)
-
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
+    if not result:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "signal": ResponseEnumeration.INSERT_INTO_VECTORDB_ERROR.value
+            }
         )
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "signal": ResponseEnumeration.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
-
     return JSONResponse(
         status_code=200,
         content={
             "signal": ResponseEnumeration.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "inserted_items_count": result["inserted_items_count"]
         }
     )
 
-@nlp_router.get("/index/info/{project_id}")
-async def get_project_index_info(request: Request, project_id: int):
-
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+@nlp_router.get("/index/info/{project_id}", dependencies=[Depends(use_request_connection)])
+async def get_project_index_info(project_id: int,
+                                 project_model: ProjectModel = Depends(get_project_model),
+                                 nlp_controller: NLPController = Depends(get_nlp_controller)):
 
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vectordb_client,
-        cross_encoder=request.app.cross_encoder,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser
-    )
-
     collection_info = await nlp_controller.get_vector_db_collection_info(
         project=project)
 
@@ -135,22 +85,12 @@ async def get_project_index_info(request: Request, project_id: int):
 
 
 @nlp_router.post("/index/search/{project_id}")
-async def search_index(request: Request, project_id: int, search_request: SearchRequest):
-
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+async def search_index(project_id: int, search_request: SearchRequest,
+                       project_model: ProjectModel = Depends(get_project_model),
+                       nlp_controller: NLPController = Depends(get_nlp_controller)):
 
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vectordb_client,
-        cross_encoder=request.app.cross_encoder,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser
-    )
-
     results = await nlp_controller.search_vector_db_collection(
         project=project,
         query=search_request.text,
@@ -174,22 +114,12 @@ async def search_index(request: Request, project_id: int, search_request: Search
     )
 
 @nlp_router.post("/index/answer/{project_id}")
-async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
-
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+async def answer_rag(project_id: int, search_request: SearchRequest,
+                     project_model: ProjectModel = Depends(get_project_model),
+                     nlp_controller: NLPController = Depends(get_nlp_controller)):
 
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vectordb_client,
-        cross_encoder=request.app.cross_encoder,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser
-    )
-
     query_vector = await nlp_controller.query_embeddings(
         text=search_request.text
     )
@@ -3,7 +3,10 @@ from typing import Optional
 
 class ProcessRequest(BaseModel):
     file_id: Optional[str] = None
-    chunk_size: Optional[int] = 100
-    overlap: Optional[int] = 20
+    chunk_size: Optional[int] = Field(1000, gt=0)  # in tokens
+    overlap: Optional[int] = Field(200, ge=0)
     do_reset: Optional[int] = 0
+    do_index: Optional[int] = 0
+    conversion_profile: Optional[str] = None  # fast, standard or rich
+    run_in_background: Optional[int] = 0
     
@@ -3,6 +3,7 @@ from typing import Optional
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    run_in_background: Optional[int] = 0
 
 class SearchRequest(BaseModel):
     text: str
@@ -1,21 +1,17 @@
 from pydantic import BaseModel
 from typing import Optional
-from fastapi import Path, UploadFile, File
 
-class UploadRequest(BaseModel):
-    project_id: int
-    file: UploadFile
+class UploadBatchRequest(BaseModel):
+    # Form fields of /upload/{project_id}/batch next to its "files" parts
+    process: Optional[int] = 0
+    do_index: Optional[int] = 0
+    conversion_profile: Optional[str] = None
 
-    @classmethod
-    def as_upload(
-        cls,
-        project_id: int = Path(...),
-        file: UploadFile = File(...)
-    ):
-        return cls(
-            project_id=project_id,
-            file=file
-        )
-    
-    
+class UploadSessionRequest(BaseModel):
+    file_name: str
+    file_size: int  # in bytes
+    content_type: str
+    sha256: Optional[str] = None  # checked when the upload is completed
 
+class UploadCompleteRequest(BaseModel):
+    sha256: Optional[str] = None
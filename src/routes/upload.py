@@ -1,16 +1,18 @@
 import os
+import asyncio
 from fastapi import APIRouter, Request, Depends
+from starlette.datastructures import UploadFile as FormUploadFile
 from fastapi.responses import JSONResponse
 from helper.config import get_settings, Settings
 from logger import setup_logger
-from models import ResponseEnumeration, AssetTypeEnum
-from models.ChunkModel import ChunkModel
+from models import ResponseEnumeration, AssetTypeEnum, JobTypeEnum
 from models.ProjectModel import ProjectModel
 from models.AssetModel import AssetModel
-from models.db_schemes import Asset, DataChunk
-from controllers import UploadController, ProcessController, NLPController
-from routes import ProcessRequest, UploadRequest
-import aiofiles
+from models.db_schemes import Asset
+from controllers import UploadController, DocumentConverterPool, IngestionController, JobController
+from routes.dependencies import get_project_model, get_asset_model, get_ingestion_controller, get_job_controller
+from routes import ProcessRequest, UploadBatchRequest, UploadSessionRequest, UploadCompleteRequest
+from pydantic import ValidationError
 
 upload_router = APIRouter(
     prefix="/api/v1",
@@ -20,20 +22,37 @@ upload_router = APIRouter(
 logger = setup_logger(name="uvicorn")
 
 @upload_router.post("/upload/{project_id}")
-async def upload_file(request: Request, upload: UploadRequest = Depends(UploadRequest.as_upload), 
-                      app_config: Settings = Depends(get_settings)):
+async def upload_file(request: Request, project_id: int,
+                      app_config: Settings = Depends(get_settings),
+                      project_model: ProjectModel = Depends(get_project_model),
+                      asset_model: AssetModel = Depends(get_asset_model)):
 
-    project_model = await ProjectModel.create_instance(db_client = request.app.db_client)
+    upload_object = UploadController()
 
-    project = await project_model.get_project_or_create_one(project_id = upload.project_id)
+    # The multipart body is parsed while it streams in, so an oversized file is cut off once it
+    # passes MAX_FILE_SIZE instead of being spooled to a temp file in full first. A declared length
+    # beyond the limit, plus room for the multipart headers, is refused before reading anything.
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > upload_object.get_max_file_size() + 65536:
+        return JSONResponse(
+            status_code=400,
+            content={"signal": ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=app_config.MAX_FILE_SIZE)}
+        )
 
-    logger.info(f"Received file upload request for project_id: {upload.project_id}, filename: {upload.file.filename}")
+    multipart_file = await upload_object.open_multipart_file(request = request, field_name = "file")
 
-     # Validate file
+    if multipart_file is None:
+        return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.NO_FILES_UPLOADED.value})
 
-    upload_object = UploadController()
+    filename, content_type, file_stream = multipart_file
+
+    project = await project_model.get_project_or_create_one(project_id = project_id)
 
-    is_valid, message = upload_object.validate_file(file = upload.file)
+    logger.info(f"Received file upload request for project_id: {project_id}, filename: {filename}")
+
+     # Validate file
+
+    is_valid, message = upload_object.validate_file_info(content_type = content_type)
 
     if not is_valid:
         logger.error(f"File validation failed: {message}")
@@ -42,29 +61,67 @@ async def upload_file(request: Request, upload: UploadRequest = Depends(UploadRe
     # Generate unique filename and save file
 
     file_location, file_id = upload_object.generate_unique_filename(
-        original_filename = upload.file.filename, 
-        project_id = upload.project_id
+        original_filename = filename, 
+        project_id = project_id
         )
 
     try:
-        async with aiofiles.open(file_location, 'wb') as f:
-            while content := await upload.file.read(app_config.FILE_DEFAULT_CHUNK_SIZE):  # Read file in chunks
-                await f.write(content)
-        logger.info(f"File saved successfully at {file_location}")
+        saved = await upload_object.save_upload_stream(
+            stream = file_stream,
+            file_location = file_location,
+            max_size = upload_object.get_max_file_size()
+        )
         
     except Exception as e:
         logger.error(f"Error saving file: {str(e)}")
         return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.FILE_UPLOAD_FAILED.value})
-    
-    asset_model = await AssetModel.create_instance(
-        db_client = request.app.db_client
+
+    if saved is None:
+        logger.error(f"File too large, upload aborted: {filename}")
+        return JSONResponse(
+            status_code=400,
+            content={"signal": ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=app_config.MAX_FILE_SIZE)}
         )
 
+    logger.info(f"File saved successfully at {file_location}")
+
+    file_hash, file_size = saved
+
+    return await register_uploaded_file(
+        asset_model = asset_model,
+        project = project,
+        file_location = file_location,
+        file_id = file_id,
+        file_hash = file_hash,
+        file_size = file_size
+    )
+
+async def register_uploaded_file(asset_model: AssetModel, project, file_location: str, file_id: str,
+                                 file_hash: str, file_size: int):
+
+    # Identical content is stored, converted and embedded only once per project
+    existing_asset = await asset_model.get_asset_by_hash(
+        asset_project_id = project.project_id,
+        asset_hash = file_hash
+    )
+
+    if existing_asset:
+        os.remove(file_location)
+        logger.info(f"Skipped duplicate of asset {existing_asset.asset_id}: {file_id}")
+        return JSONResponse(
+                status_code = 200,
+                content={
+                    "signal": ResponseEnumeration.FILE_ALREADY_UPLOADED.value,
+                    "file_id": str(existing_asset.asset_id),
+                }
+            )
+
     asset_resource = Asset(
         asset_project_id = project.project_id,
         asset_type = AssetTypeEnum.FILE.value,
         asset_name = file_id,
-        asset_size = os.path.getsize(file_location)
+        asset_size = file_size,
+        asset_hash = file_hash
     )
 
     asset_record = await asset_model.create_asset(asset = asset_resource)
@@ -77,116 +134,525 @@ async def upload_file(request: Request, upload: UploadRequest = Depends(UploadRe
             }
         )
 
-@upload_router.post("/process/{project_id}")
-async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest):
+@upload_router.put("/upload/{project_id}/{file_id}")
+async def replace_file(request: Request, project_id: int, file_id: int,
+                       app_config: Settings = Depends(get_settings),
+                       asset_model: AssetModel = Depends(get_asset_model)):
 
-    chunk_size = process_request.chunk_size
-    overlap_size = process_request.overlap
-    do_reset = process_request.do_reset
+    # Replaces the content of an uploaded file in place. The asset keeps its id and name, so the
+    # next /process of it diffs the new chunks against the stored ones and only re-embeds what changed.
+    upload_object = UploadController()
 
-    project_model = await ProjectModel.create_instance(db_client = request.app.db_client)
+    asset_records = await asset_model.get_assets_by_ids(asset_project_id = project_id, asset_ids = [file_id])
 
-    project = await project_model.get_project_or_create_one(project_id = project_id)
+    if not asset_records or asset_records[0].asset_type != AssetTypeEnum.FILE.value:
+        return JSONResponse(status_code=404, content={"signal": ResponseEnumeration.FILE_ID_ERROR.value})
+
+    asset_record = asset_records[0]
 
-    asset_model = await AssetModel.create_instance(
-        db_client = request.app.db_client
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > upload_object.get_max_file_size() + 65536:
+        return JSONResponse(
+            status_code=400,
+            content={"signal": ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=app_config.MAX_FILE_SIZE)}
         )
-    
-    chunk_model = await ChunkModel.create_instance(
-        db_client = request.app.db_client
+
+    multipart_file = await upload_object.open_multipart_file(request = request, field_name = "file")
+
+    if multipart_file is None:
+        return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.NO_FILES_UPLOADED.value})
+
+    filename, content_type, file_stream = multipart_file
+
+    is_valid, message = upload_object.validate_file_info(content_type = content_type)
+
+    # The stored name decides how the file is converted, so its type cannot change
+    if is_valid and os.path.splitext(filename)[-1].lower() != os.path.splitext(asset_record.asset_name)[-1].lower():
+        is_valid, message = False, ResponseEnumeration.INVALID_FILE_TYPE.value.format(file_type=content_type)
+
+    if not is_valid:
+        logger.error(f"File validation failed: {message}")
+        return JSONResponse(status_code=400, content={"signal": message})
+
+    # Written next to the stored file first, a failed or oversized upload leaves the old content untouched
+    temp_location, _ = upload_object.generate_unique_filename(
+        original_filename = f"{asset_record.asset_name}.part",
+        project_id = project_id
     )
-    
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vectordb_client,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser
+
+    try:
+        saved = await upload_object.save_upload_stream(
+            stream = file_stream,
+            file_location = temp_location,
+            max_size = upload_object.get_max_file_size()
+        )
+
+    except Exception as e:
+        logger.error(f"Error saving file: {str(e)}")
+        if os.path.exists(temp_location):
+            os.remove(temp_location)
+        return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.FILE_UPLOAD_FAILED.value})
+
+    if saved is None:
+        logger.error(f"File too large, replace aborted: {filename}")
+        return JSONResponse(
+            status_code=400,
+            content={"signal": ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=app_config.MAX_FILE_SIZE)}
+        )
+
+    file_hash, file_size = saved
+
+    if file_hash == asset_record.asset_hash:
+        os.remove(temp_location)
+        return JSONResponse(
+            status_code = 200,
+            content = {
+                "signal": ResponseEnumeration.FILE_ALREADY_UPLOADED.value,
+                "file_id": str(asset_record.asset_id)
+            }
+        )
+
+    os.replace(temp_location, os.path.join(os.path.dirname(temp_location), asset_record.asset_name))
+
+    _ = await asset_model.update_asset_content(
+        asset_id = asset_record.asset_id,
+        asset_hash = file_hash,
+        asset_size = file_size
+    )
+
+    logger.info(f"Replaced content of asset {asset_record.asset_id}: {asset_record.asset_name}")
+
+    return JSONResponse(
+        status_code = 200,
+        content = {
+            "signal": ResponseEnumeration.FILE_REPLACED_SUCCESS.value,
+            "file_id": str(asset_record.asset_id)
+        }
     )
 
-    project_files_ids = {}
-    if process_request.file_id:
-        asset_record = await asset_model.get_asset_record(
-            asset_project_id = project.project_id,
-            asset_name = process_request.file_id
+@upload_router.post("/upload/{project_id}/batch")
+async def upload_files_batch(request: Request, project_id: int, app_config: Settings = Depends(get_settings),
+                             project_model: ProjectModel = Depends(get_project_model),
+                             asset_model: AssetModel = Depends(get_asset_model),
+                             job_controller: JobController = Depends(get_job_controller)):
+
+    # Parsed by hand so the number of files follows UPLOAD_BATCH_MAX_FILES, not starlette's default.
+    # Expects multipart "files" parts, plus optional "process", "do_index" and "conversion_profile" fields.
+    form = await request.form(max_files=app_config.UPLOAD_BATCH_MAX_FILES)
+
+    try:
+        files = [f for f in form.getlist("files") if isinstance(f, FormUploadFile)]
+
+        try:
+            batch_request = UploadBatchRequest(
+                process = form.get("process") or 0,
+                do_index = form.get("do_index") or 0,
+                conversion_profile = form.get("conversion_profile") or None
+            )
+        except ValidationError as e:
+            logger.error(f"Invalid batch upload fields: {str(e)}")
+            return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.UPLOAD_FIELDS_INVALID.value})
+
+        process_request = ProcessRequest(
+            do_index = batch_request.do_index,
+            conversion_profile = batch_request.conversion_profile
         )
+        do_process = batch_request.process
+
+        if not files:
+            return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.NO_FILES_UPLOADED.value})
 
-        if not asset_record:
+        if process_request.conversion_profile and \
+                not DocumentConverterPool.is_profile_supported(process_request.conversion_profile):
             return JSONResponse(
                 status_code = 400,
-                content = {
-                    "signal":ResponseEnumeration.FILE_ID_ERROR.value
-                }
+                content = {"signal": ResponseEnumeration.CONVERSION_PROFILE_ERROR.value}
             )
-        
-        project_files_ids = {
-            asset_record.asset_id: asset_record.asset_name
+
+        project = await project_model.get_project_or_create_one(project_id = project_id)
+
+        upload_object = UploadController()
+        semaphore = asyncio.Semaphore(app_config.UPLOAD_BATCH_CONCURRENCY)
+
+        async def save_file(file: FormUploadFile):
+
+            is_valid, message = upload_object.validate_file(file = file)
+            if not is_valid:
+                return {"file_name": file.filename, "signal": message}
+
+            async with semaphore:
+                file_location, file_id = upload_object.generate_unique_filename(
+                    original_filename = file.filename,
+                    project_id = project.project_id
+                )
+
+                try:
+                    saved = await upload_object.save_upload_stream(
+                        stream = upload_object.iter_upload_file(file),
+                        file_location = file_location,
+                        max_size = upload_object.get_max_file_size()
+                    )
+                except Exception as e:
+                    logger.error(f"Error saving file {file.filename}: {str(e)}")
+                    return {"file_name": file.filename, "signal": ResponseEnumeration.FILE_UPLOAD_FAILED.value}
+
+            if saved is None:
+                return {
+                    "file_name": file.filename,
+                    "signal": ResponseEnumeration.FILE_TOO_LARGE.value.format(file_size=app_config.MAX_FILE_SIZE)
+                }
+
+            return {
+                "file_name": file.filename,
+                "file_location": file_location,
+                "asset_name": file_id,
+                "file_hash": saved[0],
+                "file_size": saved[1]
+            }
+
+        results = await asyncio.gather(*[save_file(file) for file in files])
+
+    finally:
+        await form.close()
+
+    saved_files = [result for result in results if "file_hash" in result]
+
+    # Duplicates of stored assets, or of an earlier file in this batch, are dropped like in upload_file
+    existing_assets = await asset_model.get_assets_by_hashes(
+        asset_project_id = project.project_id,
+        asset_hashes = list({result["file_hash"] for result in saved_files})
+    )
+
+    hash_owners = {}
+    for asset_record in existing_assets:
+        hash_owners.setdefault(asset_record.asset_hash, {"file_id": str(asset_record.asset_id)})
+
+    new_files = []
+    for result in saved_files:
+        owner = hash_owners.get(result["file_hash"])
+
+        if owner is not None:
+            os.remove(result["file_location"])
+            result["signal"] = ResponseEnumeration.FILE_ALREADY_UPLOADED.value
+            result["duplicate_of"] = owner
+            continue
+
+        hash_owners[result["file_hash"]] = result
+        new_files.append(result)
+
+    asset_records = await asset_model.create_many_assets(assets=[
+        {
+            "asset_project_id": project.project_id,
+            "asset_type": AssetTypeEnum.FILE.value,
+            "asset_name": result["asset_name"],
+            "asset_size": result["file_size"],
+            "asset_hash": result["file_hash"]
         }
-    
-    else:
-        asset_files = await asset_model.get_all_project_assets(
-            asset_project_id = project.project_id,
-            asset_type = AssetTypeEnum.FILE.value
+        for result in new_files
+    ])
+
+    for result, asset_record in zip(new_files, asset_records):
+        result["signal"] = ResponseEnumeration.FILE_UPLOADED_SUCCESS.value
+        result["file_id"] = str(asset_record.asset_id)
+
+    files_response = [
+        {
+            "file_name": result["file_name"],
+            "signal": result["signal"],
+            "file_id": result["duplicate_of"]["file_id"] if "duplicate_of" in result else result.get("file_id")
+        }
+        for result in results
+    ]
+
+    logger.info(f"Batch upload for project {project.project_id}: {len(asset_records)} new of {len(files)} files")
+
+    if not saved_files:
+        return JSONResponse(
+            status_code = 400,
+            content = {
+                "signal": ResponseEnumeration.NO_FILES_UPLOADED.value,
+                "files": files_response
+            }
+        )
+
+    content = {
+        "signal": ResponseEnumeration.FILES_UPLOADED_SUCCESS.value,
+        "files": files_response
+    }
+
+    if do_process and asset_records:
+        job_payload = process_request.model_dump(exclude={"run_in_background", "file_id"})
+        job_payload["asset_ids"] = [asset_record.asset_id for asset_record in asset_records]
+
+        job = await job_controller.enqueue_job(
+            project_id = project.project_id,
+            job_type = JobTypeEnum.PROCESS.value,
+            job_payload = job_payload
+        )
+        content["job_id"] = job.job_id
+
+    return JSONResponse(
+        status_code = 200,
+        content = content
+    )
+
+# Resumable uploads: create a session, PUT the parts at their byte offsets (in parallel and
+# retried as needed), check which ranges are still missing, then complete to verify and store.
+
+@upload_router.post("/upload/{project_id}/sessions")
+async def create_upload_session(project_id: int, session_request: UploadSessionRequest,
+                                project_model: ProjectModel = Depends(get_project_model)):
+
+    upload_object = UploadController()
+
+    is_valid, message = upload_object.validate_file_info(
+        content_type = session_request.content_type,
+        file_size = session_request.file_size
+    )
+
+    if not is_valid or session_request.file_size <= 0:
+        logger.error(f"Upload session validation failed: {message}")
+        return JSONResponse(status_code=400, content={"signal": message})
+
+    project = await project_model.get_project_or_create_one(project_id = project_id)
+
+    session = upload_object.create_upload_session(
+        project_id = project.project_id,
+        file_name = session_request.file_name,
+        file_size = session_request.file_size,
+        content_type = session_request.content_type,
+        sha256 = session_request.sha256
+    )
+
+    return JSONResponse(
+        status_code = 201,
+        content = {
+            "signal": ResponseEnumeration.UPLOAD_SESSION_CREATED.value,
+            "session_id": session["session_id"],
+            "part_size": session["part_size"]
+        }
+    )
+
+@upload_router.get("/upload/{project_id}/sessions/{session_id}")
+async def get_upload_session(project_id: int, session_id: str):
+
+    upload_object = UploadController()
+
+    session = upload_object.get_upload_session(project_id = project_id, session_id = session_id)
+
+    if not session:
+        return JSONResponse(
+            status_code = 404,
+            content = {"signal": ResponseEnumeration.UPLOAD_SESSION_NOT_FOUND.value}
         )
 
-        project_files_ids = {
-            asset_record.asset_id: asset_record.asset_name
-            for asset_record in asset_files
+    parts, missing_ranges = upload_object.get_session_parts(session = session)
+
+    return JSONResponse(
+        content = {
+            "signal": ResponseEnumeration.UPLOAD_SESSION_RETRIEVED.value,
+            "session_id": session_id,
+            "file_size": session["file_size"],
+            "received_bytes": session["file_size"] - sum(end - start for start, end in missing_ranges),
+            "parts": [[offset, size] for offset, size in parts],
+            "missing_ranges": missing_ranges
         }
+    )
 
-    
-    if len(project_files_ids) == 0:
+@upload_router.put("/upload/{project_id}/sessions/{session_id}")
+async def upload_session_part(request: Request, project_id: int, session_id: str, offset: int = 0):
+
+    upload_object = UploadController()
+
+    session = upload_object.get_upload_session(project_id = project_id, session_id = session_id)
+
+    if not session:
+        return JSONResponse(
+            status_code = 404,
+            content = {"signal": ResponseEnumeration.UPLOAD_SESSION_NOT_FOUND.value}
+        )
+
+    if offset < 0 or offset >= session["file_size"]:
         return JSONResponse(
             status_code = 400,
-            content={
-                "signal": ResponseEnumeration.NO_FILES_ERROR.value,
+            content = {"signal": ResponseEnumeration.UPLOAD_PART_INVALID.value}
+        )
+
+    try:
+        part_size = await upload_object.save_session_part(
+            session = session,
+            offset = offset,
+            stream = request.stream()
+        )
+    except Exception as e:
+        logger.error(f"Error saving upload part: {str(e)}")
+        return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.FILE_UPLOAD_FAILED.value})
+
+    # A part running past the declared file size is rejected while it streams
+    if part_size is None:
+        return JSONResponse(
+            status_code = 400,
+            content = {"signal": ResponseEnumeration.UPLOAD_PART_INVALID.value}
+        )
+
+    return JSONResponse(
+        content = {
+            "signal": ResponseEnumeration.UPLOAD_PART_RECEIVED.value,
+            "offset": offset,
+            "size": part_size
+        }
+    )
+
+@upload_router.post("/upload/{project_id}/sessions/{session_id}/complete")
+async def complete_upload_session(project_id: int, session_id: str,
+                                  complete_request: UploadCompleteRequest,
+                                  project_model: ProjectModel = Depends(get_project_model),
+                                  asset_model: AssetModel = Depends(get_asset_model)):
+
+    upload_object = UploadController()
+
+    session = upload_object.get_upload_session(project_id = project_id, session_id = session_id)
+
+    if not session:
+        return JSONResponse(
+            status_code = 404,
+            content = {"signal": ResponseEnumeration.UPLOAD_SESSION_NOT_FOUND.value}
+        )
+
+    _, missing_ranges = upload_object.get_session_parts(session = session)
+
+    if missing_ranges:
+        return JSONResponse(
+            status_code = 409,
+            content = {
+                "signal": ResponseEnumeration.UPLOAD_INCOMPLETE.value,
+                "missing_ranges": missing_ranges
             }
         )
-    
-    process_controller = ProcessController(project_id=project_id)
-    
-    no_records = 0
-    no_files = 0
 
-    if do_reset:
-        nlp_controller = nlp_controller.reset_vector_db_collection(
-            project = project
+    project = await project_model.get_project_or_create_one(project_id = project_id)
+
+    file_location, file_id = upload_object.generate_unique_filename(
+        original_filename = session["file_name"],
+        project_id = project.project_id
+    )
+
+    try:
+        file_hash = await upload_object.assemble_session_file(
+            session = session,
+            file_location = file_location
         )
-        _ = await chunk_model.delete_chunks_by_project_id(
-            project_id = project.project_id
+    except Exception as e:
+        logger.error(f"Error assembling upload session {session_id}: {str(e)}")
+        return JSONResponse(status_code=400, content={"signal": ResponseEnumeration.FILE_UPLOAD_FAILED.value})
+
+    expected_hash = complete_request.sha256 or session["sha256"]
+
+    # The parts are kept so the client can re-send the corrupted ranges and complete again
+    if expected_hash and expected_hash.lower() != file_hash:
+        os.remove(file_location)
+        return JSONResponse(
+            status_code = 400,
+            content = {
+                "signal": ResponseEnumeration.UPLOAD_CHECKSUM_MISMATCH.value,
+                "sha256": file_hash
+            }
         )
-    
-    for asset_id, asset_name in project_files_ids.items():
 
-        chunks = process_controller.load_and_export(
-            file_name = asset_name
+    upload_object.remove_upload_session(session = session)
+
+    logger.info(f"Upload session {session_id} assembled at {file_location}")
+
+    return await register_uploaded_file(
+        asset_model = asset_model,
+        project = project,
+        file_location = file_location,
+        file_id = file_id,
+        file_hash = file_hash,
+        file_size = session["file_size"]
+    )
+
+@upload_router.post("/process/{project_id}")
+async def process_endpoint(project_id: int, process_request: ProcessRequest,
+                           project_model: ProjectModel = Depends(get_project_model),
+                           ingestion_controller: IngestionController = Depends(get_ingestion_controller),
+                           job_controller: JobController = Depends(get_job_controller)):
+
+    do_reset = process_request.do_reset
+
+    if process_request.conversion_profile and \
+            not DocumentConverterPool.is_profile_supported(process_request.conversion_profile):
+        return JSONResponse(
+            status_code = 400,
+            content = {
+                "signal": ResponseEnumeration.CONVERSION_PROFILE_ERROR.value
+            }
         )
 
-        if chunks is None or len(chunks) == 0:
-            return JSONResponse(
-                status_code = 400,
-                content={
-                    "signal": ResponseEnumeration.PROCESSING_FAILED.value
-                }
-            )
-        
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(chunks)
-        ]
+    project = await project_model.get_project_or_create_one(project_id = project_id)
+
+    if process_request.run_in_background:
+        job = await job_controller.enqueue_job(
+            project_id = project.project_id,
+            job_type = JobTypeEnum.PROCESS.value,
+            job_payload = process_request.model_dump(exclude={"run_in_background"})
+        )
+
+        return JSONResponse(
+            status_code = 202,
+            content = {
+                "signal": ResponseEnumeration.JOB_QUEUED.value,
+                "job_id": job.job_id
+            }
+        )
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+    project_files_ids = await ingestion_controller.get_project_files(
+        project = project,
+        file_id = process_request.file_id
+    )
+
+    if project_files_ids is None:
+        return JSONResponse(
+            status_code = 400,
+            content = {
+                "signal":ResponseEnumeration.FILE_ID_ERROR.value
+            }
+        )
+
+    if len(project_files_ids) == 0:
+        return JSONResponse(
+            status_code = 400,
+            content={
+                "signal": ResponseEnumeration.NO_FILES_ERROR.value,
+            }
+        )
+
+    result = await ingestion_controller.process_project(
+        project = project,
+        project_files_ids = project_files_ids,
+        do_reset = do_reset,
+        chunk_size = process_request.chunk_size,
+        overlap = process_request.overlap,
+        do_index = process_request.do_index,
+        conversion_profile = process_request.conversion_profile
+    )
+
+    if not result:
+        return JSONResponse(
+            status_code = 400,
+            content={
+                "signal": ResponseEnumeration.PROCESSING_FAILED.value
+            }
+        )
 
     return JSONResponse(
         content={
             "signal": ResponseEnumeration.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": no_files
+            "inserted_chunks": result["inserted_chunks"],
+            "unchanged_chunks": result["unchanged_chunks"],
+            "deleted_chunks": result["deleted_chunks"],
+            "processed_files": result["processed_files"],
+            "skipped_files": result["skipped_files"],
+            "indexed_chunks": result.get("indexed_chunks", 0)
         }
     )
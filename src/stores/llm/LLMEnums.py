@@ -3,6 +3,7 @@ from enum import Enum
 class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
+    LOCAL = "LOCAL"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
@@ -19,6 +19,23 @@ class LLMInterface(ABC):
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         pass
 
+    @abstractmethod
+    def get_embedding_fingerprint(self):
+        # Identifies what produced the vectors, cached embeddings are only reused for the same fingerprint
+        pass
+
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history = [], max_output_tokens: int = None, temperature: float = None):
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def aclose(self):
+        pass
+
     @abstractmethod
     def construt_prompt(self, prompt: str, role: str):
         pass
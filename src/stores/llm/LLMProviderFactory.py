@@ -1,5 +1,6 @@
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CohereProvider
+from .providers import OpenAIProvider, CohereProvider, LocalProvider
+from .http_client import build_async_http_client
 
 class LLMProviderFactory:
 
@@ -12,6 +13,7 @@ class LLMProviderFactory:
             return OpenAIProvider(
                 api_key=self.config.OPENAI_API_KEY,
                 api_url=self.config.OPENAI_API_URL,
+                http_client=build_async_http_client(self.config),
                 default_input_max_characters=self.config.DAFAULT_INPUT_MAX_CHARACTERS,
                 default_output_max_tokens=self.config.DAFAULT_OUTPUT_MAX_TOKENS,
                 default_temperature=self.config.DAFAULT_TEMPERATURE
@@ -20,9 +22,24 @@ class LLMProviderFactory:
         if provider == LLMEnums.COHERE.value:
             return CohereProvider(
                 api_key=self.config.COHERE_API_KEY,
+                http_client=build_async_http_client(self.config),
                 default_input_max_characters=self.config.DAFAULT_INPUT_MAX_CHARACTERS,
                 default_output_max_tokens=self.config.DAFAULT_OUTPUT_MAX_TOKENS,
                 default_temperature=self.config.DAFAULT_TEMPERATURE
             )
+
+        if provider == LLMEnums.LOCAL.value:
+            return LocalProvider(
+                model_backend=self.config.LOCAL_EMBEDDING_MODEL_BACKEND,
+                device=self.config.LOCAL_EMBEDDING_DEVICE,
+                num_threads=self.config.LOCAL_EMBEDDING_THREADS,
+                quantize_int8=self.config.LOCAL_EMBEDDING_QUANTIZE_INT8,
+                onnx_file_name=self.config.LOCAL_EMBEDDING_ONNX_FILE_NAME,
+                normalize_embeddings=self.config.LOCAL_EMBEDDING_NORMALIZE,
+                query_prefix=self.config.LOCAL_EMBEDDING_QUERY_PREFIX,
+                document_prefix=self.config.LOCAL_EMBEDDING_DOCUMENT_PREFIX,
+                batch_size=self.config.LOCAL_EMBEDDING_BATCH_SIZE,
+                max_wait_ms=self.config.LOCAL_EMBEDDING_MAX_WAIT_MS
+            )
         
         return None
\ No newline at end of file
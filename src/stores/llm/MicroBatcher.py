@@ -0,0 +1,114 @@
+import asyncio
+import contextvars
+from logger import logger
+
+class MicroBatcher:
+    # Coalesces items submitted by concurrent callers into batches for process_batch, an async
+    # callable taking a list of items and returning one result per item. A batch is dispatched
+    # once it holds max_batch_size items or max_wait_ms after its first item arrived.
+    # Up to max_concurrent_batches batches are processed at once, 1 keeps them strictly serial
+    # for a process_batch that can only run one at a time.
+
+    def __init__(self, process_batch, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 max_concurrent_batches: int = 1):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_slots = asyncio.Semaphore(max_concurrent_batches)
+        self.batch_tasks = set()
+
+        # Created on first use, they belong to the event loop that is running then
+        self.queue = None
+        self.worker = None
+
+    def ensure_started(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        if self.worker is None or self.worker.done():
+            # A fresh context, the worker outlives the caller and must not inherit its
+            # request-scoped state such as the database connection
+            self.worker = asyncio.create_task(self.run(), context=contextvars.Context())
+
+    async def submit(self, item):
+        results = await self.submit_many([item])
+        return results[0]
+
+    async def submit_many(self, items: list):
+        self.ensure_started()
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self.queue.put_nowait((item, future))
+            futures.append(future)
+
+        return await asyncio.gather(*futures)
+
+    async def collect_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        # Short polls instead of wait_for(queue.get()), which can drop an item on timeout before 3.12
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, 0.001))
+
+        # Callers that gave up while waiting are left out
+        return [(item, future) for item, future in batch if not future.cancelled()]
+
+    async def run(self):
+        # A free slot is taken before collecting, so items keep joining the next batch while
+        # every slot is busy, and collecting resumes as soon as a batch is dispatched
+        while True:
+            await self.batch_slots.acquire()
+            try:
+                batch = await self.collect_batch()
+            except BaseException:
+                self.batch_slots.release()
+                raise
+
+            if not batch:
+                self.batch_slots.release()
+                continue
+
+            task = asyncio.create_task(self.dispatch_batch(batch))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+
+    async def dispatch_batch(self, batch: list):
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(batch)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batch_slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        if self.worker is None:
+            return
+
+        tasks = [self.worker, *self.batch_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.worker = None
@@ -0,0 +1,20 @@
+import importlib.util
+import httpx
+
+def build_async_http_client(config) -> httpx.AsyncClient:
+    # One pooled client per provider, so concurrent requests reuse warm keep-alive connections
+    # instead of paying a TLS handshake each. HTTP/2 is only enabled when the h2 package is installed.
+    http2 = config.LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        timeout=httpx.Timeout(
+            config.LLM_HTTP_TIMEOUT_SECONDS,
+            connect=config.LLM_HTTP_CONNECT_TIMEOUT_SECONDS
+        )
+    )
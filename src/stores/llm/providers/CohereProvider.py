@@ -7,6 +7,7 @@ import cohere
 class CohereProvider(LLMInterface):
 
     def __init__(self, api_key: str,
+                 http_client=None,
                  default_input_max_characters: int = 1000,
                  default_output_max_tokens: int = 1000,
                  default_temperature: float = 0.1):
@@ -22,9 +23,16 @@ class CohereProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # Embed accepts 96 texts per request, each truncated at 512 tokens
+        self.embedding_max_batch_size = 96
+        self.embedding_max_batch_tokens = None
+        self.embedding_tokenizer_encoding = None
+
         self.enums = CoHereEnums
 
         self.client = cohere.ClientV2(api_key=self.api_key)
+        self.http_client = http_client
+        self.async_client = cohere.AsyncClientV2(api_key=self.api_key, httpx_client=self.http_client)
 
         self.logger = logger
     
@@ -35,6 +43,9 @@ class CohereProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_dimension
 
+    def get_embedding_fingerprint(self):
+        return self.embedding_model_id
+
     def generate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
         if not self.client:
             logger.error("Cohere client is not initialized.")
@@ -58,10 +69,38 @@ class CohereProvider(LLMInterface):
             temperature=temperature
         )
 
-        if not response or not response.message.content[0].text:
+        return self.parse_generation_response(response)
+
+    async def agenerate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
+        if not self.async_client:
+            logger.error("Cohere client is not initialized.")
+            return None
+
+        if not self.generation_model_id:
+            logger.error("Generation model is not set.")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_output_max_tokens
+        temperature = temperature if temperature is not None else self.default_temperature
+
+        chat_history.append(
+            self.construt_prompt(prompt, role=CoHereEnums.USER.value)
+        )
+
+        response = await self.async_client.chat(
+            model=self.generation_model_id,
+            messages=chat_history,
+            max_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+        return self.parse_generation_response(response)
+
+    def parse_generation_response(self, response):
+        if not response or not response.message.content or not response.message.content[0].text:
             logger.error("No response from Cohere API.")
             return None
-        
+
         return response.message.content[0].text
     
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
@@ -74,27 +113,57 @@ class CohereProvider(LLMInterface):
             logger.error("Embedding model is not set.")
             return None
         
-        input_type = CoHereEnums.DOCUMENT.value
-        if document_type == DocumentTypeEnum.QUERY.value:
-            input_type = CoHereEnums.QUERY.value
-
         if isinstance(text, str):
             text = [text]
         
         res = self.client.embed(
             model = self.embedding_model_id,
             texts = text,
-            input_type = input_type,
+            input_type = self.get_input_type(document_type),
+            embedding_types=["float"],
+        )
+
+        return self.parse_embedding_response(res)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            logger.error("Cohere client is not initialized.")
+            return None
+
+        if not self.embedding_model_id:
+            logger.error("Embedding model is not set.")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        res = await self.async_client.embed(
+            model = self.embedding_model_id,
+            texts = text,
+            input_type = self.get_input_type(document_type),
             embedding_types=["float"],
         )
 
+        return self.parse_embedding_response(res)
+
+    def get_input_type(self, document_type: str = None):
+        if document_type == DocumentTypeEnum.QUERY.value:
+            return CoHereEnums.QUERY.value
+        return CoHereEnums.DOCUMENT.value
+
+    def parse_embedding_response(self, res):
         if not res or not res.embeddings.float:
             logger.error("No embedding returned from Cohere.")
             return None
-        
-        
+
         return [ f for f in res.embeddings.float ]
 
+    async def aclose(self):
+        # The SDK has no close of its own, the pooled httpx client is closed directly
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
 
     def construt_prompt(self, prompt: str, role: str):
 
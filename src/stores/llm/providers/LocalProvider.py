@@ -0,0 +1,184 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import DocumentTypeEnum
+from ..MicroBatcher import MicroBatcher
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List
+from logger import logger
+import asyncio
+import hashlib
+import json
+
+class LocalProvider(LLMInterface):
+    # Embeds on CPU inside the service with a sentence-transformers model, torch or ONNX.
+    # Texts from concurrent callers are micro-batched into one encode() call, which runs on a
+    # single dedicated thread so the model's own intra-op threads are not oversubscribed.
+    # Embedding only, there is no local generation model.
+
+    def __init__(self, model_backend: str = "torch",
+                 device: str = "cpu",
+                 num_threads: int = None,
+                 quantize_int8: bool = False,
+                 onnx_file_name: str = None,
+                 normalize_embeddings: bool = True,
+                 query_prefix: str = "",
+                 document_prefix: str = "",
+                 batch_size: int = 32,
+                 max_wait_ms: float = 5.0):
+
+        self.model_backend = model_backend
+        self.device = device
+        self.num_threads = num_threads
+        self.quantize_int8 = quantize_int8
+        self.onnx_file_name = onnx_file_name
+        self.normalize_embeddings = normalize_embeddings
+        self.query_prefix = query_prefix or ""
+        self.document_prefix = document_prefix or ""
+        self.batch_size = batch_size
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        # Batches are packed by the micro-batcher, not by EmbeddingBatcher
+        self.embedding_max_batch_size = None
+        self.embedding_max_batch_tokens = None
+        self.embedding_tokenizer_encoding = None
+
+        self.model = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-embedding")
+        self.micro_batcher = MicroBatcher(
+            process_batch=self.encode_batch,
+            max_batch_size=batch_size,
+            max_wait_ms=max_wait_ms,
+            max_concurrent_batches=1  # one encode thread, a second batch would only queue behind it
+        )
+
+        self.enums = None
+
+        self.logger = logger
+
+    def set_generation_model(self, model_id: str):
+        logger.error("The local backend only provides embeddings.")
+
+    def set_embedding_model(self, model_id: str, embedding_dimension: int):
+        self.embedding_model_id = model_id
+        self.model = self.load_model(model_id)
+
+        # The model knows its own dimension, EMBEDDING_MODEL_DIMENSION only has to match it when set
+        self.embedding_size = self.model.get_sentence_embedding_dimension()
+        if embedding_dimension and int(embedding_dimension) != self.embedding_size:
+            logger.warning(
+                f"EMBEDDING_MODEL_DIMENSION is {embedding_dimension} but {model_id} "
+                f"produces {self.embedding_size} dimensions, using {self.embedding_size}."
+            )
+
+    def get_embedding_fingerprint(self):
+        # Prefixes, normalization and quantization all change the vectors of the same model id
+        if not self.embedding_model_id:
+            return None
+
+        options = json.dumps({
+            "backend": self.model_backend,
+            "onnx_file_name": self.onnx_file_name,
+            "quantize_int8": self.quantize_int8,
+            "normalize_embeddings": self.normalize_embeddings,
+            "query_prefix": self.query_prefix,
+            "document_prefix": self.document_prefix,
+        }, sort_keys=True)
+
+        return f"{self.embedding_model_id}#{hashlib.sha256(options.encode('utf-8')).hexdigest()[:16]}"
+
+    def load_model(self, model_id: str):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        model_kwargs = {}
+        if self.model_backend == "onnx":
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            if self.num_threads:
+                session_options.intra_op_num_threads = self.num_threads
+            model_kwargs["session_options"] = session_options
+
+            # int8 ONNX models are separate files, e.g. onnx/model_qint8_avx512_vnni.onnx
+            if self.onnx_file_name:
+                model_kwargs["file_name"] = self.onnx_file_name
+
+        model = SentenceTransformer(
+            model_id,
+            device=self.device,
+            backend=self.model_backend,
+            model_kwargs=model_kwargs or None
+        )
+
+        if self.quantize_int8 and self.model_backend == "torch":
+            # Dynamic quantization of the linear layers, CPU only
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        model.eval()
+        return model
+
+    def generate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
+        logger.error("The local backend only provides embeddings.")
+        return None
+
+    async def agenerate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
+        return self.generate_text(prompt, chat_history, max_output_tokens, temperature)
+
+    def add_prefix(self, texts: List[str], document_type: str = None):
+        prefix = self.query_prefix if document_type == DocumentTypeEnum.QUERY.value else self.document_prefix
+        if not prefix:
+            return texts
+        return [f"{prefix}{text}" for text in texts]
+
+    def encode(self, texts: List[str]):
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize_embeddings,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    async def encode_batch(self, texts: List[str]):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.encode, texts)
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.model:
+            logger.error("Embedding model is not set.")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        return self.encode(self.add_prefix(text, document_type))
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.model:
+            logger.error("Embedding model is not set.")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        return await self.micro_batcher.submit_many(self.add_prefix(text, document_type))
+
+    def construt_prompt(self, prompt: str, role: str):
+
+        return {
+            "role": role,
+            "content": prompt
+        }
+
+    async def aclose(self):
+        await self.micro_batcher.close()
+        self.executor.shutdown(wait=False)
@@ -1,13 +1,14 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
 from logger import logger
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from typing import Union, List
 
 class OpenAIProvider(LLMInterface):
 
     def __init__(self, api_key: str,
                  api_url: str = None,
+                 http_client=None,
                  default_input_max_characters: int = 1000,
                  default_output_max_tokens: int = 1000,
                  default_temperature: float = 0.1):
@@ -24,11 +25,22 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # Request limits of the embeddings endpoint, EmbeddingBatcher packs batches within them
+        self.embedding_max_batch_size = 2048
+        self.embedding_max_batch_tokens = 300000
+        self.embedding_tokenizer_encoding = "cl100k_base"
+
         self.client = OpenAI(
             api_key=self.api_key,
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client=http_client
+        )
+
         self.enums = OpenAIEnums
 
         self.logger = logger
@@ -40,6 +52,9 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_dimension
 
+    def get_embedding_fingerprint(self):
+        return self.embedding_model_id
+
     def generate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
 
         if not self.client:
@@ -63,12 +78,40 @@ class OpenAIProvider(LLMInterface):
             max_tokens=max_output_tokens,
             temperature=temperature
         )
-        if not response or 'choices' not in response or len(response['choices']) == 0 or response.choices[0].message.content is None:
+        return self.parse_generation_response(response)
+
+    async def agenerate_text(self, prompt: str, chat_history=[], max_output_tokens: int = None, temperature: float = None):
+
+        if not self.async_client:
+            logger.error("OpenAI client is not initialized.")
+            return None
+
+        if not self.generation_model_id:
+            logger.error("Generation model is not set.")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_output_max_tokens
+        temperature = temperature if temperature is not None else self.default_temperature
+
+        chat_history.append(
+            self.construt_prompt(prompt, role=OpenAIEnums.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model=self.generation_model_id,
+            messages=chat_history,
+            max_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+        return self.parse_generation_response(response)
+
+    def parse_generation_response(self, response):
+        if not response or not response.choices or response.choices[0].message.content is None:
             logger.error("No response returned from OpenAI.")
             return None
 
-        generated_text = response.choices[0].message.content
-        return generated_text
+        return response.choices[0].message.content
 
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
 
@@ -88,12 +131,38 @@ class OpenAIProvider(LLMInterface):
             model=self.embedding_model_id
         )
 
-        if not response or 'data' not in response or len(response['data']) == 0 or response.data[0].embedding is None:
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            logger.error("OpenAI client is not initialized.")
+            return None
+
+        if not self.embedding_model_id:
+            logger.error("Embedding model is not set.")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        response = await self.async_client.embeddings.create(
+            input=text,
+            model=self.embedding_model_id
+        )
+
+        return self.parse_embedding_response(response)
+
+    def parse_embedding_response(self, response):
+        if not response or not response.data or response.data[0].embedding is None:
             logger.error("No embedding returned from OpenAI.")
             return None
-        
+
         return [rec.embedding for rec in response.data]
 
+    async def aclose(self):
+        await self.async_client.close()
+
     def construt_prompt(self, prompt: str, role: str):
 
         return {
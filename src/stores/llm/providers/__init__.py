@@ -1,2 +1,3 @@
 from .OpenAIProvider import OpenAIProvider
-from .CohereProvider import CohereProvider
\ No newline at end of file
+from .CohereProvider import CohereProvider
+from .LocalProvider import LocalProvider
\ No newline at end of file
@@ -40,6 +40,10 @@ class VectorDBInterface(ABC):
     def insert_many(self, collection_name: str, texts: List[str], vectors: List[List], metadatas: List[dict] = None, ids: List[str] = None, batch_size: int = 50):
         pass
 
+    @abstractmethod
+    def delete_by_ids(self, collection_name: str, ids: List[int]) -> bool:
+        pass
+
     @abstractmethod
     def search_by_vector(self, collection_name: str, text: str, query_vector: List, limit: int)-> List[RetrievedDocument]:
         pass   
\ No newline at end of file
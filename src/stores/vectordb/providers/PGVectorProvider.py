@@ -126,8 +126,7 @@ class PGVectorProvider(VectorDBInterface):
                         f'{PgVectorTableSchemeEnums.TEXT.value} text, '
                         f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
                         f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
-                        f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
-                        f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
+                        f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer'
                         ')'
                     )
                     await session.execute(create_collection)
@@ -286,6 +285,25 @@ class PGVectorProvider(VectorDBInterface):
 
         return True
 
+    async def delete_by_ids(self, collection_name: str, ids: List[int]) -> bool:
+
+        is_collection_existed = await self.is_collection_exists(collection_name=collection_name)
+
+        if not is_collection_existed:
+            self.logger.error(
+                f"Can not delete records from non-existed collection: {collection_name}")
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(
+                    f'DELETE FROM {collection_name} '
+                    f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:chunk_ids)'
+                )
+                await session.execute(delete_sql, {"chunk_ids": list(ids)})
+
+        return True
+
     async def search_by_vector(self, collection_name: str, text: str,  query_vector: List, limit: int) -> List[RetrievedDocument]:
 
         is_collection_existed = await self.is_collection_exists(collection_name=collection_name)
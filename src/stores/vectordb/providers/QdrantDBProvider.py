@@ -203,6 +203,23 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
 
+    async def delete_by_ids(self, collection_name: str, ids: List[int]) -> bool:
+
+        if not await self.is_collection_exists(collection_name):
+            logger.error(f"Collection {collection_name} does not exist.")
+            return False
+
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=ids)
+            )
+        except Exception as e:
+            logger.error(f"Error while deleting points: {e}")
+            return False
+
+        return True
+
     async def search_by_vector(self, collection_name: str, text: str, query_vector: List, limit: int):
 
         results = self.client.query_points(
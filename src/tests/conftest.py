@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# The settings have no defaults for these, the tests never reach the services they point at
+for name, value in {
+    "APP_NAME": "mini-rag-test",
+    "FILE_ALLOWED_EXTENSIONS": '["text/plain"]',
+    "MAX_FILE_SIZE": "10",
+    "FILE_DEFAULT_CHUNK_SIZE": "512000",
+    "POSTGRES_USERNAME": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_MAIN_DATABASE": "minirag",
+    "GENERATION_BACKEND": "OPENAI",
+    "EMBEDDING_BACKEND": "OPENAI",
+    "VECTOR_DB_BACKEND": "PGVECTOR",
+    "INDEX_THRESHOLD": "100",
+    "DEFAULT_LANG": "en",
+}.items():
+    os.environ.setdefault(name, value)
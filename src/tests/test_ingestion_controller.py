@@ -0,0 +1,213 @@
+import asyncio
+from types import SimpleNamespace
+from controllers import IngestionController as ingestion_module
+from controllers.IngestionController import IngestionController
+from controllers.ProcessController import ProcessController
+
+FILES = {
+    1: ["alpha", "beta"],
+    2: ["gamma", "delta", "epsilon"],
+}
+
+class FakeChunkModel:
+    chunks = {}
+
+    @classmethod
+    async def create_instance(cls, db_client):
+        return cls()
+
+    async def get_asset_chunk_hashes(self, project_id, asset_id):
+        return [c for c in self.chunks.values() if c.chunk_asset_id == asset_id]
+
+    async def insert_many_chunks(self, chunks):
+        ids = []
+        for chunk in chunks:
+            chunk_id = len(self.chunks) + 1
+            self.chunks[chunk_id] = SimpleNamespace(chunk_id=chunk_id, **chunk)
+            ids.append(chunk_id)
+        return ids
+
+    async def delete_chunks_by_ids(self, project_id, chunk_ids):
+        for chunk_id in chunk_ids:
+            self.chunks.pop(chunk_id, None)
+
+    async def delete_chunks_by_project_id(self, project_id):
+        self.chunks.clear()
+
+    async def update_chunks_order(self, chunks_order):
+        for order in chunks_order:
+            self.chunks[order["chunk_id"]].chunk_order = order["chunk_order"]
+
+    async def get_chunked_asset_ids(self, project_id):
+        return {c.chunk_asset_id for c in self.chunks.values()}
+
+    async def get_total_chunks_count(self, project_id):
+        return len(self.chunks)
+
+    async def iter_project_chunks(self, project_id, page_size=500):
+        chunks = sorted(self.chunks.values(), key=lambda c: c.chunk_id)
+        for start in range(0, len(chunks), page_size):
+            yield chunks[start: start + page_size]
+
+class FakeAssetModel:
+
+    @classmethod
+    async def create_instance(cls, db_client):
+        return cls()
+
+    async def get_all_project_assets(self, asset_project_id, asset_type):
+        return []
+
+class FakeProjectModel:
+    index_incomplete = False
+
+    @classmethod
+    async def create_instance(cls, db_client):
+        return cls()
+
+    async def is_index_incomplete(self, project_id):
+        return FakeProjectModel.index_incomplete
+
+    async def set_index_incomplete(self, project_id, index_incomplete):
+        FakeProjectModel.index_incomplete = index_incomplete
+        return True
+
+class FakeVectorDBClient:
+
+    def __init__(self):
+        self.collections = {}
+        self.fail_inserts = False
+
+    async def is_collection_exists(self, collection_name):
+        return collection_name in self.collections
+
+    async def create_collection(self, collection_name, embedding_size, do_reset=False):
+        if do_reset or collection_name not in self.collections:
+            self.collections[collection_name] = {}
+
+    async def create_cache_collection(self, cache_name, embedding_size, do_reset=False):
+        return True
+
+    async def delete_collection(self, collection_name):
+        return self.collections.pop(collection_name, None) is not None
+
+    async def insert_many(self, collection_name, texts, vectors, metadatas=None, ids=None):
+        if self.fail_inserts:
+            return False
+        for chunk_id, text in zip(ids, texts):
+            assert chunk_id not in self.collections[collection_name], "chunk indexed twice"
+            self.collections[collection_name][chunk_id] = text
+        return True
+
+    async def delete_by_ids(self, collection_name, ids):
+        for chunk_id in ids:
+            self.collections[collection_name].pop(chunk_id, None)
+        return True
+
+class FakeEmbeddingBatcher:
+
+    async def embed(self, texts, document_type, token_counts=None):
+        return [[0.0] for _ in texts]
+
+class FakeNLPController:
+
+    def __init__(self):
+        self.vector_db_client = FakeVectorDBClient()
+        self.embedding_client = SimpleNamespace(embedding_size=1)
+        self.embedding_batcher = FakeEmbeddingBatcher()
+
+    def create_collection_name(self, project_id):
+        return f"collection_{project_id}"
+
+    def create_cache_name(self, project_id):
+        return f"cache_{project_id}"
+
+    async def is_vector_db_collection_exists(self, project):
+        return await self.vector_db_client.is_collection_exists(self.create_collection_name(project.project_id))
+
+    async def reset_vector_db_collection(self, project):
+        return await self.vector_db_client.delete_collection(self.create_collection_name(project.project_id))
+
+    async def delete_from_vector_db(self, project, chunks_ids):
+        return await self.vector_db_client.delete_by_ids(self.create_collection_name(project.project_id), chunks_ids)
+
+    async def index_into_vector_db(self, project, chunks, chunks_ids, do_reset=False):
+        return await self.vector_db_client.insert_many(
+            collection_name=self.create_collection_name(project.project_id),
+            texts=[c.chunk_text for c in chunks],
+            vectors=[[0.0] for _ in chunks],
+            ids=chunks_ids
+        )
+
+    def indexed_texts(self, project):
+        return sorted(self.vector_db_client.collections.get(self.create_collection_name(project.project_id), {}).values())
+
+async def fake_load_and_export_batches(self, executor, file_name):
+    yield [SimpleNamespace(page_content=text, metadata={"source": file_name}) for text in FILES[int(file_name)]]
+
+def make_controller(monkeypatch):
+    FakeChunkModel.chunks = {}
+    FakeProjectModel.index_incomplete = False
+    monkeypatch.setattr(ingestion_module, "ChunkModel", FakeChunkModel)
+    monkeypatch.setattr(ingestion_module, "AssetModel", FakeAssetModel)
+    monkeypatch.setattr(ingestion_module, "ProjectModel", FakeProjectModel)
+    monkeypatch.setattr(ProcessController, "load_and_export_batches", fake_load_and_export_batches)
+
+    nlp_controller = FakeNLPController()
+    controller = IngestionController(db_client=None, process_pool=None, nlp_controller=nlp_controller)
+    return controller, nlp_controller
+
+def all_texts():
+    return sorted(text for texts in FILES.values() for text in texts)
+
+def process(controller, project, do_index):
+    return asyncio.run(controller.process_project(
+        project=project,
+        project_files_ids={asset_id: str(asset_id) for asset_id in FILES},
+        do_index=do_index
+    ))
+
+def test_process_without_index_then_with_index_indexes_stored_chunks(monkeypatch):
+    controller, nlp_controller = make_controller(monkeypatch)
+    project = SimpleNamespace(project_id=1)
+
+    process(controller, project, do_index=False)
+    assert nlp_controller.indexed_texts(project) == []
+    assert len(FakeChunkModel.chunks) == len(all_texts())
+
+    # Every chunk is unchanged on the second run, none of them is new
+    result = process(controller, project, do_index=True)
+
+    assert result["inserted_chunks"] == 0
+    assert result["indexed_chunks"] == len(all_texts())
+    assert nlp_controller.indexed_texts(project) == all_texts()
+    assert FakeProjectModel.index_incomplete is False
+
+def test_failed_indexing_is_backfilled_on_the_next_run(monkeypatch):
+    controller, nlp_controller = make_controller(monkeypatch)
+    project = SimpleNamespace(project_id=1)
+
+    nlp_controller.vector_db_client.fail_inserts = True
+    assert process(controller, project, do_index=True) is False
+    assert FakeProjectModel.index_incomplete is True
+
+    nlp_controller.vector_db_client.fail_inserts = False
+    result = process(controller, project, do_index=True)
+
+    assert result["indexed_chunks"] == len(all_texts())
+    assert nlp_controller.indexed_texts(project) == all_texts()
+    assert FakeProjectModel.index_incomplete is False
+
+def test_indexed_project_only_indexes_new_chunks(monkeypatch):
+    controller, nlp_controller = make_controller(monkeypatch)
+    project = SimpleNamespace(project_id=1)
+
+    process(controller, project, do_index=True)
+    assert nlp_controller.indexed_texts(project) == all_texts()
+
+    monkeypatch.setitem(FILES, 2, ["gamma", "delta", "zeta"])
+    result = process(controller, project, do_index=False)
+
+    assert result["inserted_chunks"] == 1
+    assert result["indexed_chunks"] == 1
+    assert nlp_controller.indexed_texts(project) == all_texts()
@@ -1,12 +1,43 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import time
 
 # Define metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+DB_POOL_CHECKED_OUT = Gauge('db_pool_connections_checked_out', 'Postgres connections currently checked out of the pool')
+DB_POOL_OVERFLOW = Gauge('db_pool_connections_overflow', 'Postgres connections open beyond the pool size')
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a Postgres connection from the pool',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+EMBEDDED_TEXTS = Counter('embedding_texts_total', 'Texts embedded by the embedding provider', ['provider'])
+EMBEDDING_BATCH_LATENCY = Histogram(
+    'embedding_batch_duration_seconds', 'Latency of one embedding provider request', ['provider'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+QUERY_EMBEDDING_BATCH_SIZE = Histogram(
+    'query_embedding_batch_size', 'Query texts coalesced into one embedding call',
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+EMBEDDING_CACHE_LOOKUPS = Counter('embedding_cache_lookups_total', 'Embedding cache lookups by result', ['result'])
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # Times every checkout, waiting on a full pool and opening a new connection included
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start_time)
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
 
@@ -23,6 +54,18 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
         return response
 
 
+def setup_db_pool_metrics(engine):
+
+    pool = engine.sync_engine.pool
+
+    def update_pool_gauges(*args):
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    event.listen(engine.sync_engine, "checkout", update_pool_gauges)
+    event.listen(engine.sync_engine, "checkin", update_pool_gauges)
+
+
 def setup_metrics(app: FastAPI):
 
     app.add_middleware(PrometheusMiddleware)